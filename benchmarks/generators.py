@@ -0,0 +1,112 @@
+import random
+from collections import namedtuple
+import numpy as np
+from utils.graph_utils import CSRGraph
+
+# A benchmark problem: the graph (a CSRGraph on nodes 0..n-1), node
+# coordinates as an (n, 2) array (None if the graph has no geometry) and the
+# start/goal pair searched between.
+Instance = namedtuple('Instance', ['name', 'graph', 'pos', 'start', 'goal'])
+
+
+def _corners(pos):
+    """Nodes closest to the bottom-left and top-right corners"""
+    return int(np.argmin(pos.sum(axis=1))), int(np.argmax(pos.sum(axis=1)))
+
+
+def random_geometric(n, degree=8, seed=0):
+    """Random geometric graph: uniform points in the unit square
+
+    Points closer than the radius that gives the expected degree are joined;
+    weights are the Euclidean distances.
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    radius = np.sqrt(degree / (np.pi * n))
+
+    # Bucket points into radius-sized cells and only compare neighbouring cells
+    cells = int(np.ceil(1 / radius))
+    cx, cy = np.minimum((pos / radius).astype(np.int64).T, cells - 1)
+    cell = cx * cells + cy
+    order = np.argsort(cell, kind='stable')
+    starts = np.searchsorted(cell[order], np.arange(cells * cells + 1))
+    sources, targets = [], []
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        ox, oy = cx + dx, cy + dy
+        valid = (ox >= 0) & (ox < cells) & (oy >= 0) & (oy < cells)
+        points = np.flatnonzero(valid)
+        other = ox[valid] * cells + oy[valid]
+        counts = starts[other + 1] - starts[other]
+        # Pair every point with every point of the neighbouring cell
+        a = np.repeat(points, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        b = order[np.repeat(starts[other], counts) + offsets]
+        keep = a < b if (dx, dy) == (0, 0) else np.ones(len(a), dtype=bool)
+        a, b = a[keep], b[keep]
+        close = np.linalg.norm(pos[a] - pos[b], axis=1) < radius
+        sources.append(a[close])
+        targets.append(b[close])
+
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    weights = np.linalg.norm(pos[sources] - pos[targets], axis=1)
+    graph = CSRGraph.from_arrays(range(n), sources, targets, weights)
+    start, goal = _corners(pos)
+    return Instance(f"geometric-{n}", graph, pos, start, goal)
+
+
+def grid(n, max_weight=10, seed=0):
+    """4-connected square grid of about n nodes with integer weights 1..max_weight"""
+    rng = np.random.default_rng(seed)
+    side = max(int(np.sqrt(n)), 2)
+    ids = np.arange(side * side).reshape(side, side)
+    sources = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+    targets = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+    weights = rng.integers(1, max_weight + 1, len(sources)).astype(np.float64)
+    graph = CSRGraph.from_arrays(range(side * side), sources, targets, weights)
+    pos = np.column_stack((ids.ravel() // side, ids.ravel() % side)) / (side - 1)
+    return Instance(f"grid-{side * side}", graph, pos, 0, side * side - 1)
+
+
+def scale_free(n, m=3, max_weight=10, seed=0):
+    """Barabasi-Albert preferential attachment graph with m edges per new node"""
+    rng = random.Random(seed)
+    # Every edge endpoint is listed once, so a uniform pick from the list
+    # picks nodes proportionally to their degree
+    endpoints = []
+    sources, targets = [], []
+    for node in range(1, m + 1):
+        sources.append(0)
+        targets.append(node)
+        endpoints.extend((0, node))
+    for node in range(m + 1, n):
+        count = len(endpoints)
+        chosen = {endpoints[int(rng.random() * count)] for _ in range(m)}
+        for target in chosen:
+            sources.append(node)
+            targets.append(target)
+            endpoints.extend((node, target))
+
+    weights = np.random.default_rng(seed).integers(1, max_weight + 1, len(sources))
+    graph = CSRGraph.from_arrays(range(n), sources, targets, weights.astype(np.float64))
+    return Instance(f"scale-free-{n}", graph, None, 0, n - 1)
+
+
+def complete_tsp(n, seed=0):
+    """Complete graph on n uniform cities weighted by Euclidean distance
+
+    Tabu Search works on the dense n x n matrix, so keep n to a few thousand.
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    sources, targets = np.triu_indices(n, 1)
+    weights = np.linalg.norm(pos[sources] - pos[targets], axis=1)
+    graph = CSRGraph.from_arrays(range(n), sources, targets, weights)
+    return Instance(f"tsp-{n}", graph, pos, 0, n - 1)
+
+
+GENERATORS = {
+    'geometric': random_geometric,
+    'grid': grid,
+    'scale-free': scale_free,
+    'tsp': complete_tsp,
+}
@@ -0,0 +1,211 @@
+"""Headless benchmarks of DFS, UCS and Tabu Search on synthetic graphs
+
+    python -m benchmarks.run --suite quick --output baseline.json
+    python -m benchmarks.run --suite quick --compare baseline.json
+
+Search time is the best of --repeat runs. Peak memory is measured in a
+separate run under tracemalloc, because tracing slows the search down.
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from benchmarks.generators import GENERATORS
+from search_algorithms.uninformed.dfs import DFS
+from search_algorithms.uninformed.ucs import UCS
+from search_algorithms.uninformed.bidirectional import BidirectionalUCS
+from search_algorithms.tabu_search.tabu import TabuSearch
+
+SUITES = {
+    'quick': {'sizes': [100, 1000, 10000], 'tsp_sizes': [100, 300], 'tabu_iterations': 100},
+    'full': {'sizes': [100, 1000, 10000, 100000, 1000000], 'tsp_sizes': [100, 500, 1000, 2000],
+             'tabu_iterations': 200},
+}
+GRAPH_GENERATORS = ['geometric', 'grid', 'scale-free']
+SEARCHES = {'dfs': DFS, 'ucs': UCS, 'bidirectional': BidirectionalUCS}
+NEIGHBORHOODS = ['swap', '2-opt']
+
+
+def measure(run, repeat=3, memory=True):
+    """Return (best seconds, peak traced bytes or None, result of the last run)"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def bench_search(instance, name, repeat, memory):
+    search = SEARCHES[name](instance.graph)
+    seconds, peak, path = measure(lambda: search.search(instance.start, instance.goal), repeat, memory)
+    return {
+        'benchmark': f"{instance.name}/{name}",
+        'algorithm': name,
+        'nodes': len(instance.graph),
+        'edges': instance.graph.number_of_edges(),
+        'seconds': seconds,
+        'expansions': search.stats.expansions,
+        'expansions_per_second': search.stats.expansions / seconds if seconds else None,
+        'pushes': search.stats.pushes,
+        'peak_frontier': search.stats.peak_frontier,
+        'stale_pops': search.stats.stale_pops,
+        'peak_bytes': peak,
+        'path_length': len(path) if path else None,
+    }
+
+
+def bench_tabu(instance, neighborhood, iterations, repeat, memory, seed):
+    def run():
+        # A fresh seeded search per run, so every run follows the same trajectory
+        tabu = TabuSearch(instance.graph, max_iter=iterations, neighborhood=neighborhood, seed=seed)
+        return tabu, tabu.search()
+
+    seconds, peak, (tabu, best) = measure(run, repeat, memory)
+    return {
+        'benchmark': f"{instance.name}/tabu-{neighborhood}",
+        'algorithm': f"tabu-{neighborhood}",
+        'nodes': len(instance.graph),
+        'edges': instance.graph.number_of_edges(),
+        'seconds': seconds,
+        'iterations': tabu.iterations,
+        'seconds_per_iteration': seconds / tabu.iterations if tabu.iterations else None,
+        'neighbors_evaluated': tabu.stats.neighbors_evaluated,
+        'peak_bytes': peak,
+        'initial_cost': tabu.stats.initial_cost,
+        'construction_seconds': tabu.stats.times['construction'],
+        'best_cost': tabu.calculate_cost(best),
+    }
+
+
+def run_suite(suite, generators=None, algorithms=None, sizes=None, repeat=3, memory=True,
+              seed=0, log=print):
+    """Run the benchmarks of a suite and return the list of result records"""
+    config = SUITES[suite]
+    generators = generators or GRAPH_GENERATORS + ['tsp']
+    algorithms = algorithms or list(SEARCHES) + ['tabu']
+    results = []
+    for generator in generators:
+        if generator == 'tsp':
+            if 'tabu' not in algorithms:
+                continue
+            for size in sizes or config['tsp_sizes']:
+                instance = GENERATORS[generator](size, seed=seed)
+                for neighborhood in NEIGHBORHOODS:
+                    results.append(bench_tabu(instance, neighborhood, config['tabu_iterations'],
+                                              repeat, memory, seed))
+                    log(format_result(results[-1]))
+            continue
+        for size in sizes or config['sizes']:
+            instance = GENERATORS[generator](size, seed=seed)
+            for name in algorithms:
+                if name in SEARCHES:
+                    results.append(bench_search(instance, name, repeat, memory))
+                    log(format_result(results[-1]))
+    return results
+
+
+def format_result(result):
+    line = f"{result['benchmark']:<32} {result['seconds']:10.4f}s"
+    if 'expansions' in result:
+        line += f" {result['expansions']:10,} exp"
+    if result.get('expansions_per_second'):
+        line += f" {result['expansions_per_second']:12,.0f} exp/s"
+    if result.get('seconds_per_iteration'):
+        line += f" {result['seconds_per_iteration'] * 1000:9.3f} ms/iter"
+    if result['peak_bytes'] is not None:
+        line += f" {result['peak_bytes'] / 2 ** 20:9.1f} MiB peak"
+    return line
+
+
+def environment():
+    """Describe the machine and code version the results come from"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def compare(results, baseline, tolerance=0.1, min_seconds=0.005, min_bytes=2 ** 20, log=print):
+    """Print time/memory ratios against a baseline and return the regressions
+
+    Results below min_seconds/min_bytes in the baseline are too noisy to
+    count as regressions.
+    """
+    previous = {result['benchmark']: result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get(result['benchmark'])
+        if old is None:
+            log(f"{result['benchmark']:<32} (not in baseline)")
+            continue
+        ratio = result['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+        line = f"{result['benchmark']:<32} time x{ratio:5.2f}"
+        regressed = ratio > 1 + tolerance and old['seconds'] >= min_seconds
+        if result['peak_bytes'] and old.get('peak_bytes'):
+            memory_ratio = result['peak_bytes'] / old['peak_bytes']
+            line += f"  memory x{memory_ratio:5.2f}"
+            regressed = regressed or (memory_ratio > 1 + tolerance and old['peak_bytes'] >= min_bytes)
+        if regressed:
+            line += "  REGRESSION"
+            regressions.append(result['benchmark'])
+        log(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suite', choices=sorted(SUITES), default='quick')
+    parser.add_argument('--generators', help="Comma separated: " + ", ".join(GENERATORS))
+    parser.add_argument('--algorithms', help="Comma separated: dfs, ucs, bidirectional, tabu")
+    parser.add_argument('--sizes', help="Comma separated node counts (overrides the suite)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc run")
+    parser.add_argument('--output', help="Save the results as a JSON baseline")
+    parser.add_argument('--compare', help="Baseline JSON to compare the results with")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="Allowed slowdown/growth before a result counts as a regression")
+    args = parser.parse_args(argv)
+
+    def split(value, convert=str):
+        return [convert(item) for item in value.split(',')] if value else None
+
+    results = run_suite(args.suite, split(args.generators), split(args.algorithms),
+                        split(args.sizes, int), args.repeat, not args.no_memory, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'suite': args.suite, 'seed': args.seed, 'environment': environment(),
+                       'results': results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Answer a batch of search queries on one graph without the GUI
+
+    python main.py graph.csv queries.jsonl --workers 4 > results.jsonl
+
+The query file has one query per line, either JSON lines
+({"algorithm": "ucs", "start": "A", "goal": "B"}) or a CSV file with a
+header row. algorithm is dfs, ucs, bidirectional, astar or tabu.
+
+DFS also takes max_depth, UCS and bidirectional UCS max_cost, and A*
+heuristic and max_cost. Tabu Search takes max_iter, tabu_size,
+neighborhood, candidates, seed, time_limit, max_evaluations, patience,
+restart_after and construction (random, nearest-neighbor or greedy; the
+graph has no coordinates for space-filling-curve). Its results include the
+convergence history and why the run stopped.
+
+An id field is passed through (the query's 0-based index in the file by
+default). Results are written as JSON lines, in query order, as soon as
+they are ready.
+
+UCS queries from a start seen before are answered from that start's cached
+shortest-path tree (up to --cache-mb per worker), so grouping queries by
+start helps.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from search_algorithms.uninformed.dfs import DFS
+from search_algorithms.uninformed.ucs import UCS
+from search_algorithms.uninformed.path_cache import ShortestPathCache
+from search_algorithms.uninformed.bidirectional import BidirectionalUCS
+from search_algorithms.informed.astar import AStar
+from search_algorithms.tabu_search.tabu import TabuSearch
+from utils.graph_io import read_graph, load_csr, save_csr
+from utils.graph_utils import resolve_node
+
+SEARCHES = {'dfs': DFS, 'ucs': UCS, 'bidirectional': BidirectionalUCS, 'astar': AStar}
+SEARCH_PARAMS = {'dfs': {'max_depth': int}, 'ucs': {'max_cost': float},
+                 'bidirectional': {'max_cost': float}, 'astar': {'heuristic': str, 'max_cost': float}}
+TABU_PARAMS = {'max_iter': int, 'tabu_size': int, 'neighborhood': str, 'candidates': int, 'seed': int,
+               'time_limit': float, 'max_evaluations': int, 'patience': int, 'restart_after': int,
+               'construction': str}
+
+# Graph of the current process (mapped read-only from the same file by every
+# worker), its UCS path cache and the search objects built on it, reused
+# across queries so that per-graph setup such as A* landmarks is done once
+# per worker
+_graph = None
+_cache = None
+_searches = {}
+
+
+def _set_graph(csr, cache_bytes):
+    global _graph, _cache
+    _graph = csr
+    _cache = ShortestPathCache(cache_bytes)
+    _searches.clear()
+
+
+def _init_worker(path, cache_bytes):
+    _set_graph(load_csr(path), cache_bytes)
+
+
+def read_queries(path):
+    """Return the queries of a JSON lines or CSV file as dicts"""
+    queries = []
+    with open(path, newline='') as f:
+        if os.path.splitext(path)[1].lower() in ('.jsonl', '.json'):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            # Empty CSV cells mean "use the default"
+            rows = ({key: value for key, value in row.items() if value not in ('', None)}
+                    for row in csv.DictReader(f))
+        for i, row in enumerate(rows):
+            row.setdefault('id', i)
+            queries.append(row)
+    return queries
+
+
+def _params(query, types):
+    unknown = set(query) - set(types)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    # null (JSON) turns a limit off
+    return {name: None if value is None else types[name](value) for name, value in query.items()}
+
+
+def _search(algorithm, params):
+    key = (algorithm, tuple(sorted(params.items())))
+    search = _searches.get(key)
+    if search is None:
+        if algorithm == 'ucs':
+            params = dict(params, cache=_cache)
+        search = _searches[key] = SEARCHES[algorithm](_graph, **params)
+    return search
+
+
+def path_cost(csr, path):
+    """Sum of the edge weights along a path of node names"""
+    ids = [csr.node_id(node) for node in path]
+    return sum(csr.edge_weight(u, v) for u, v in zip(ids, ids[1:]))
+
+
+def run_query(query):
+    """Answer one query on the process' graph and return its result record"""
+    query = dict(query)
+    result = {'id': query.pop('id', None), 'algorithm': query.pop('algorithm', None)}
+    algorithm = str(result['algorithm']).lower()
+    try:
+        started = time.perf_counter()
+        if algorithm == 'tabu':
+            tabu = TabuSearch(_graph, **_params(query, TABU_PARAMS))
+            solved = tabu.solve()
+            seconds = time.perf_counter() - started
+            stats = tabu.stats
+            result.update(path=solved.best_solution, cost=tabu.calculate_cost(solved.best_solution),
+                          history=solved.history, stopped_by=solved.stopped_by)
+        elif algorithm in SEARCHES:
+            start = resolve_node(_graph, query.pop('start', None))
+            goal = resolve_node(_graph, query.pop('goal', None))
+            search = _search(algorithm, _params(query, SEARCH_PARAMS[algorithm]))
+            path = search.search(start, goal)
+            seconds = time.perf_counter() - started
+            stats = search.stats
+            result.update(start=start, goal=goal, path=path,
+                          cost=path_cost(_graph, path) if path else None)
+        else:
+            raise ValueError(f"Unknown algorithm {result['algorithm']!r}")
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+
+    result['seconds'] = seconds
+    result.update((name, getattr(stats, name)) for name in stats.COUNTERS)
+    return result
+
+
+def run_batch(graph_path, queries, workers=1, chunksize=16, directed=False, cache_bytes=256 * 2 ** 20):
+    """Answer the queries, yielding their result records in query order
+
+    With several workers the graph is shared through a binary graph file
+    (written to a temporary file unless graph_path already is one) that every
+    worker memory maps, so it is loaded once and not copied per process.
+    """
+    if workers <= 1:
+        _set_graph(read_graph(graph_path, directed), cache_bytes)
+        for query in queries:
+            yield run_query(query)
+        return
+
+    temporary = None
+    if os.path.splitext(graph_path)[1].lower() != '.csrg':
+        fd, temporary = tempfile.mkstemp(suffix='.csrg')
+        os.close(fd)
+        save_csr(read_graph(graph_path, directed), temporary)
+        graph_path = temporary
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(graph_path, cache_bytes)) as pool:
+            yield from pool.map(run_query, queries, chunksize=chunksize)
+    finally:
+        if temporary is not None:
+            os.remove(temporary)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('graph', help="Edge list (CSV/TSV), GraphML or binary graph file")
+    parser.add_argument('queries', help="JSON lines or CSV query file")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunksize', type=int, default=16, help="Queries sent to a worker at a time")
+    parser.add_argument('--directed', action='store_true', help="Read edge lists as directed")
+    parser.add_argument('--output', help="Write the results here instead of to stdout")
+    parser.add_argument('--cache-mb', type=float, default=256,
+                        help="Memory for cached UCS shortest-path trees per worker")
+    args = parser.parse_args(argv)
+
+    queries = read_queries(args.queries)
+    output = open(args.output, 'w') if args.output else sys.stdout
+    failed = 0
+    try:
+        for result in run_batch(args.graph, queries, args.workers, args.chunksize, args.directed,
+                                int(args.cache_mb * 2 ** 20)):
+            failed += 'error' in result
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
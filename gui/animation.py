@@ -0,0 +1,180 @@
+import time
+
+
+class AnimationScheduler:
+    """Drive a search's step generator from the Tk event loop with after()
+
+    Every tick runs as many search steps as the current speed allows (read
+    from steps_per_second() each tick, so the speed slider works mid-run),
+    emits them to the search's listeners and renders at most one frame.
+    Rendering is decoupled from stepping: when a frame takes longer than the
+    frame interval the next frames are dropped. In fast-forward mode each tick
+    runs steps for a fixed compute budget and frames are drawn only rarely,
+    so the run finishes at search speed.
+
+    Time spent stepping, rendering and waiting between ticks goes to the
+    search's stats, and its profiler (if set) runs during ticks only.
+    """
+
+    def __init__(self, widget, search, steps, on_done, steps_per_second=lambda: 2.0,
+                 on_error=None, frame_interval=1 / 30, compute_budget=0.05, fast_frame_interval=0.25):
+        self.widget = widget
+        self.search = search
+        self.steps = steps
+        self.on_done = on_done
+        self.on_error = on_error
+        self.steps_per_second = steps_per_second
+        self.frame_interval = frame_interval
+        self.compute_budget = compute_budget
+        self.fast_frame_interval = fast_frame_interval
+
+        self.paused = False
+        self.fast = False
+        self.done = False
+        self.result = None
+        self.step_count = 0
+        self.frames = 0
+        self.dropped_frames = 0
+        self._job = None
+        self._credit = 0.0
+        self._last_tick = None
+        self._tick_end = None
+        self._next_frame = 0.0
+
+    def start(self):
+        self._last_tick = time.perf_counter()
+        self._schedule(0)
+        return self
+
+    def pause(self):
+        self.paused = True
+        self._tick_end = None  # Time spent paused is not sleep
+        self._cancel_job()
+
+    def resume(self):
+        if self.done or not self.paused:
+            return
+        self.paused = False
+        self._last_tick = time.perf_counter()
+        self._schedule(0)
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def step(self):
+        """Advance a single search step and draw it (pauses the animation)"""
+        self.pause()
+        if not self.done:
+            with self.search.stats.profiling():
+                self._advance(1, None)
+                self._render()
+                self._finish_if_done()
+
+    def fast_forward(self, enabled=True):
+        self.fast = enabled
+        if self.paused:
+            self.resume()
+
+    def cancel(self):
+        """Stop the run without calling on_done"""
+        self._cancel_job()
+        self.done = True
+        self.steps.close()
+        self.search.stats.stop()
+
+    def _schedule(self, delay):
+        self._cancel_job()
+        self._job = self.widget.after(max(int(delay * 1000), 1), self._tick)
+
+    def _cancel_job(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        self._job = None
+        if self.paused or self.done:
+            return
+        now = time.perf_counter()
+        if self._tick_end is not None:
+            self.search.stats.add_time('sleep', now - self._tick_end)
+        with self.search.stats.profiling():
+            self._run_tick(now)
+        self._tick_end = time.perf_counter()
+
+    def _run_tick(self, now):
+        if self.fast:
+            advanced = self._advance(None, now + self.compute_budget)
+        else:
+            self._credit += (now - self._last_tick) * max(self.steps_per_second(), 0.0)
+            count = int(self._credit)
+            self._credit -= count
+            advanced = self._advance(count, now + self.compute_budget) if count else 0
+        self._last_tick = now
+
+        if self._finish_if_done():
+            return
+        if time.perf_counter() >= self._next_frame:
+            self._render()
+        elif advanced:
+            self.dropped_frames += 1
+        self._schedule(0 if self.fast else self.frame_interval)
+
+    def _advance(self, count, deadline):
+        """Run up to count steps (unbounded if None) until the deadline"""
+        emit, clock = self.search.emit, time.perf_counter
+        advanced = 0
+        search_time = emit_time = 0.0
+        started = clock()
+        try:
+            while count is None or advanced < count:
+                started = clock()
+                event = next(self.steps)
+                stepped = clock()
+                emit(event)
+                search_time += stepped - started
+                emit_time += clock() - stepped
+                advanced += 1
+                if deadline is not None and advanced % 64 == 0 and clock() >= deadline:
+                    break
+        except StopIteration as stop:
+            search_time += clock() - started
+            self.done = True
+            self.result = stop.value
+        except Exception as error:
+            self.done = True
+            self.on_done = None
+            self._cancel_job()
+            self.search.stats.stop()
+            if self.on_error is None:
+                raise
+            self.on_error(error)
+        self.step_count += advanced
+        self.search.stats.add_time('search', search_time)
+        self.search.stats.add_time('render', emit_time)
+        return advanced
+
+    def _render(self):
+        visualizer = self.search.visualizer
+        if visualizer is None:
+            return
+        started = time.perf_counter()
+        visualizer.render()
+        finished = time.perf_counter()
+        self.frames += 1
+        interval = self.fast_frame_interval if self.fast else self.frame_interval
+        # A slow frame pushes the next one back instead of queueing up frames
+        self._next_frame = finished + max(interval, finished - started)
+
+    def _finish_if_done(self):
+        if not self.done:
+            return False
+        if self.on_done is not None:
+            self._render()
+            self.search.stats.stop()
+            on_done, self.on_done = self.on_done, None
+            on_done(self.result)
+        return True
@@ -13,7 +13,7 @@ class ControlPanel:
         ttk.Label(self.parent, text="Algorithm:").pack(pady=(0, 5))
         self.algorithm_var = tk.StringVar()
         self.algorithm_menu = ttk.Combobox(self.parent, textvariable=self.algorithm_var,
-                                           values=["DFS", "UCS", "Tabu Search"])
+                                           values=["DFS", "UCS", "A*", "Tabu Search"])
         self.algorithm_menu.pack(fill=tk.X, pady=(0, 10))
         self.algorithm_menu.current(0)
 
@@ -0,0 +1,61 @@
+class EditBatch:
+    """Coalesce the refreshes requested by graph edits
+
+    Edits made between begin() and commit() (or inside a `with` block) only
+    mark the view stale; the outermost commit refreshes once. Edits made one
+    at a time are debounced instead: the refresh runs once no edit has come
+    in for `delay` milliseconds.
+    """
+
+    def __init__(self, widget, refresh, delay=50):
+        self.widget = widget
+        self.refresh = refresh
+        self.delay = delay
+        self.depth = 0
+        self.stale = False
+        self.refreshes = 0
+        self._job = None
+
+    def begin(self):
+        self.depth += 1
+        return self
+
+    def commit(self):
+        if not self.depth:
+            raise RuntimeError("commit() without begin()")
+        self.depth -= 1
+        if not self.depth:
+            self.flush()
+
+    def __enter__(self):
+        return self.begin()
+
+    def __exit__(self, *exc_info):
+        # Edits made before an error are applied, so they are shown too
+        self.commit()
+
+    def request(self):
+        """Note that the view is out of date"""
+        self.stale = True
+        if self.depth:
+            return
+        self._cancel_job()
+        self._job = self.widget.after(self.delay, self.flush)
+
+    def flush(self):
+        """Refresh now if anything changed since the last refresh"""
+        self._cancel_job()
+        if self.stale:
+            self.stale = False
+            self.refreshes += 1
+            self.refresh()
+
+    def discard(self):
+        """Drop a pending refresh (the view is about to be redrawn anyway)"""
+        self._cancel_job()
+        self.stale = False
+
+    def _cancel_job(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
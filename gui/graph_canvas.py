@@ -1,26 +1,60 @@
 import tkinter as tk
 from tkinter import ttk
 import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+from gui.edit_batch import EditBatch
+from search_algorithms.uninformed.path_cache import ShortestPathCache
+from utils.graph_drawing import GraphDrawing
+from utils.graph_utils import CSRGraph, ensure_csr
+from utils.layout import LayoutCache
+from utils.render_surface import RenderSurface
 
 
 class GraphCanvas(ttk.Frame):
+    # Names and weights are drawn once at most label_limit nodes are in view;
+    # with more than density_limit edges in view they are drawn as a density
+    # image. Search visualizers draw only the explored subgraph if explored_only.
+    label_limit = 150
+    density_limit = 50000
+    explored_only = False
+
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
-        self.graph = nx.Graph()
-
-        # Create matplotlib figure and canvas
-        self.fig, self.ax = plt.subplots(figsize=(8, 6), dpi=100)
+        self._graph = nx.Graph()
+        # CSRGraph of the graph for the searches: kept from an import, else
+        # built on demand, and dropped on every edit. An imported graph is only
+        # converted to networkx (self.graph) once it is edited.
+        self.csr = None
+        self.layout = LayoutCache()
+        # UCS shortest-path trees, valid until the next edit
+        self.path_cache = ShortestPathCache()
+        # Edits redraw once per batch, or debounced when made one at a time
+        self.edits = EditBatch(self, self.draw_graph)
+
+        # One matplotlib surface shared by the graph view and every algorithm run
+        self.surface = RenderSurface(self)
+        self.fig, self.ax = self.surface.fig, self.surface.ax
         self.setup_canvas()
         self.setup_toolbar()
         self.draw_empty_graph()
 
+    @property
+    def graph(self):
+        """The graph as networkx, converted from an imported snapshot on first use"""
+        if self._graph is None:
+            self._graph = self.csr.to_networkx()
+        return self._graph
+
+    @property
+    def model(self):
+        """The graph as drawn and searched: the snapshot of an import, else networkx"""
+        return self.csr if self._graph is None else self._graph
+
     def setup_canvas(self):
         """Initialize the matplotlib canvas"""
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
-        self.canvas_widget = self.canvas.get_tk_widget()
+        self.canvas = self.surface.canvas
+        self.canvas_widget = self.surface.widget
         self.canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
     def setup_toolbar(self):
@@ -29,9 +63,15 @@ class GraphCanvas(ttk.Frame):
         self.toolbar.update()
         self.canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
+    def acquire_surface(self):
+        """Hand the cleared render surface to an algorithm visualizer"""
+        self.toolbar.update()  # Forget the zoom history of the previous view
+        self.edits.discard()  # The visualizer draws the current graph itself
+        return self.surface.reset()
+
     def draw_empty_graph(self):
         """Draw placeholder when no nodes exist"""
-        self.ax.clear()
+        self.surface.reset()
         self.ax.text(0.5, 0.5, "Add nodes to begin",
                      ha='center', va='center', fontsize=12)
         self.ax.set_axis_off()
@@ -39,78 +79,90 @@ class GraphCanvas(ttk.Frame):
 
     def draw_graph(self):
         """Redraw the entire graph with current state"""
-        self.ax.clear()
+        self.surface.reset()
 
-        if len(self.graph.nodes()) == 0:
+        graph = self.model
+        if len(graph) == 0:
             self.draw_empty_graph()
             return
 
-        # Calculate layout
-        self.pos = nx.spring_layout(self.graph)
-
-        # Draw elements
-        nx.draw_networkx_nodes(
-            self.graph, self.pos, ax=self.ax,
-            node_size=500,
-            node_color='lightblue',
-            alpha=0.9
-        )
-
-        nx.draw_networkx_edges(
-            self.graph, self.pos, ax=self.ax,
-            width=1.5,
-            edge_color='gray',
-            alpha=0.7
-        )
-
-        # Draw labels
-        nx.draw_networkx_labels(
-            self.graph, self.pos, ax=self.ax,
-            font_size=10,
-            font_color='black'
-        )
-
-        # Draw edge weights if they exist
-        edge_weights = nx.get_edge_attributes(self.graph, 'weight')
-        if edge_weights:
-            nx.draw_networkx_edge_labels(
-                self.graph, self.pos, ax=self.ax,
-                edge_labels=edge_weights,
-                font_size=8,
-                label_pos=0.5
-            )
+        # Layout is cached and only updated around changed nodes
+        self.pos = self.layout.positions(graph)
+
+        # Only what is in view is drawn, with names and weights once zoomed in
+        # far enough to read them (see GraphDrawing)
+        self.drawing = GraphDrawing(self.ax, graph, self.pos, edge_width=1.5, edge_alpha=0.7,
+                                    label_limit=self.label_limit, density_limit=self.density_limit)
 
         # Formatting
         self.ax.set_title("Graph Visualization", pad=20)
         self.ax.set_axis_off()
-        self.ax.margins(0.1)
         self.fig.tight_layout()
         self.canvas.draw()
 
+    def batch(self):
+        """Group edits so they are drawn once: `with canvas.batch(): ...`"""
+        return self.edits
+
+    def begin(self):
+        """Start a group of edits (same as entering batch())"""
+        self.edits.begin()
+
+    def commit(self):
+        """End a group of edits, redrawing once when the outermost group ends"""
+        self.edits.commit()
+
+    def snapshot(self):
+        """The CSRGraph of the current graph, converted once per edit"""
+        if self.csr is None:
+            self.csr = ensure_csr(self.graph)
+        return self.csr
+
     def add_node(self, node):
-        """Add a node to the graph and redraw"""
-        if node and node not in self.graph.nodes():
+        """Add a node to the graph and schedule a redraw"""
+        if node and node not in self.model:
             self.graph.add_node(node)
-            self.draw_graph()
+            self.csr = None
+            self.layout.touch(node)
+            self.path_cache.invalidate()
+            self.edits.request()
             return True
         return False
 
     def add_edge(self, from_node, to_node, weight=1.0):
-        """Add a weighted edge to the graph and redraw"""
-        if from_node in self.graph.nodes() and to_node in self.graph.nodes():
+        """Add a weighted edge to the graph and schedule a redraw"""
+        if from_node in self.model and to_node in self.model:
             self.graph.add_edge(from_node, to_node, weight=float(weight))
-            self.draw_graph()
+            self.csr = None
+            self.layout.touch(from_node, to_node)
+            self.path_cache.invalidate()
+            self.edits.request()
             return True
         return False
 
+    def load_graph(self, graph):
+        """Replace the graph (networkx or CSRGraph) and draw it once"""
+        if isinstance(graph, CSRGraph):
+            self._graph, self.csr = None, graph
+        else:
+            self._graph, self.csr = graph, None
+        self.layout.reset()
+        self.path_cache.invalidate()
+        self.edits.discard()
+        self.draw_graph()
+
     def clear_graph(self):
         """Reset the graph to empty state"""
-        self.graph.clear()
+        self._graph = nx.Graph()
+        self.csr = None
+        self.layout.reset()
+        self.path_cache.invalidate()
+        self.edits.discard()
         self.draw_empty_graph()
 
     def get_node_list(self):
         """Return list of nodes in graph"""
-        return list(self.graph.nodes())
+        return list(self.model)
 
     def get_edge_list(self):
         """Return list of edges with weights"""
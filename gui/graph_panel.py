@@ -1,14 +1,18 @@
 import tkinter as tk
 from tkinter import ttk
 import networkx as nx
+from gui.edit_batch import EditBatch
 from search_algorithms.uninformed.dfs import DFS
 from search_algorithms.uninformed.ucs import UCS
+from search_algorithms.informed.astar import AStar
 from search_algorithms.tabu_search.tabu import TabuSearch
 
 class GraphPanel:
     def __init__(self, parent):
         self.parent = parent
         self.graph = nx.Graph()
+        # Edits refresh the info text once per batch, or debounced one by one
+        self.edits = EditBatch(parent, self.update_info)
         self.create_widgets()
 
     def create_widgets(self):
@@ -19,21 +23,32 @@ class GraphPanel:
         # Update graph info
         self.update_info()
 
+    def batch(self):
+        """Group edits so the info is refreshed once: `with panel.batch(): ...`"""
+        return self.edits
+
+    def begin(self):
+        self.edits.begin()
+
+    def commit(self):
+        self.edits.commit()
+
     def add_node(self, node):
         self.graph.add_node(node)
-        self.update_info()
+        self.edits.request()
 
     def add_edge(self, from_node, to_node, weight):
         self.graph.add_edge(from_node, to_node, weight=weight)
-        self.update_info()
+        self.edits.request()
 
     def update_info(self):
+        # Build the whole text first and hand it to Tk in one insert
+        lines = ["Nodes: " + ", ".join(self.graph.nodes()), "", "Edges:"]
+        lines.extend(f"{u} -> {v} (weight: {data.get('weight', 1)})"
+                     for u, v, data in self.graph.edges(data=True))
         self.info_text.config(state=tk.NORMAL)
         self.info_text.delete(1.0, tk.END)
-        self.info_text.insert(tk.END, "Nodes: " + ", ".join(self.graph.nodes()) + "\n\n")
-        self.info_text.insert(tk.END, "Edges:\n")
-        for edge in self.graph.edges(data=True):
-            self.info_text.insert(tk.END, f"{edge[0]} -> {edge[1]} (weight: {edge[2].get('weight', 1)})\n")
+        self.info_text.insert(tk.END, "\n".join(lines) + "\n")
         self.info_text.config(state=tk.DISABLED)
 
     def run_algorithm(self, algorithm, params):
@@ -43,6 +58,9 @@ class GraphPanel:
         elif algorithm == "UCS":
             ucs = UCS(self.graph)
             ucs.search(params['start'], params['goal'])
+        elif algorithm == "A*":
+            astar = AStar(self.graph)
+            astar.search(params['start'], params['goal'])
         elif algorithm == "Tabu Search":
-            tabu = TabuSearch(self.graph, params['max_iter'], params['tabu_size'])
-            tabu.search(params['start'])
\ No newline at end of file
+            tabu = TabuSearch(self.graph, max_iter=params['max_iter'], tabu_size=params['tabu_size'])
+            tabu.search()
\ No newline at end of file
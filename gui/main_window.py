@@ -1,115 +1,16 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from tkinter import ttk, messagebox, filedialog
+from gui.animation import AnimationScheduler
+from gui.graph_canvas import GraphCanvas
+from gui.search_worker import SearchWorker
 from search_algorithms.uninformed.dfs import DFS
 from search_algorithms.uninformed.ucs import UCS
+from search_algorithms.uninformed.bidirectional import BidirectionalUCS
+from search_algorithms.informed.astar import AStar
 from search_algorithms.tabu_search.tabu import TabuSearch
-
-
-class GraphCanvas(ttk.Frame):
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.parent = parent
-        self.graph = nx.Graph()
-
-        # Create matplotlib figure
-        self.fig, self.ax = plt.subplots(figsize=(8, 6), dpi=100)
-        self.setup_canvas()
-        self.setup_toolbar()
-        self.draw_empty_graph()
-
-    def setup_canvas(self):
-        """Initialize the matplotlib canvas"""
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-    def setup_toolbar(self):
-        """Add matplotlib navigation toolbar"""
-        self.toolbar = NavigationToolbar2Tk(self.canvas, self)
-        self.toolbar.update()
-        self.canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-    def draw_empty_graph(self):
-        """Draw placeholder when no nodes exist"""
-        self.ax.clear()
-        self.ax.text(0.5, 0.5, "Add nodes to begin",
-                     ha='center', va='center', fontsize=12)
-        self.ax.set_axis_off()
-        self.canvas.draw()
-
-    def draw_graph(self):
-        """Redraw the entire graph with current state"""
-        self.ax.clear()
-
-        if len(self.graph.nodes()) == 0:
-            self.draw_empty_graph()
-            return
-
-        # Calculate layout
-        self.pos = nx.spring_layout(self.graph)
-
-        # Draw elements
-        nx.draw_networkx_nodes(
-            self.graph, self.pos, ax=self.ax,
-            node_size=500,
-            node_color='lightblue',
-            alpha=0.9
-        )
-
-        nx.draw_networkx_edges(
-            self.graph, self.pos, ax=self.ax,
-            width=1.5,
-            edge_color='gray',
-            alpha=0.7
-        )
-
-        # Draw labels
-        nx.draw_networkx_labels(
-            self.graph, self.pos, ax=self.ax,
-            font_size=10,
-            font_color='black'
-        )
-
-        # Draw edge weights if they exist
-        edge_weights = nx.get_edge_attributes(self.graph, 'weight')
-        if edge_weights:
-            nx.draw_networkx_edge_labels(
-                self.graph, self.pos, ax=self.ax,
-                edge_labels=edge_weights,
-                font_size=8,
-                label_pos=0.5
-            )
-
-        # Formatting
-        self.ax.set_title("Graph Visualization", pad=20)
-        self.ax.set_axis_off()
-        self.ax.margins(0.1)
-        self.fig.tight_layout()
-        self.canvas.draw()
-
-    def add_node(self, node):
-        """Add a node to the graph and redraw"""
-        if node and node not in self.graph.nodes():
-            self.graph.add_node(node)
-            self.draw_graph()
-            return True
-        return False
-
-    def add_edge(self, from_node, to_node, weight=1.0):
-        """Add a weighted edge to the graph and redraw"""
-        if from_node in self.graph.nodes() and to_node in self.graph.nodes():
-            self.graph.add_edge(from_node, to_node, weight=float(weight))
-            self.draw_graph()
-            return True
-        return False
-
-    def clear_graph(self):
-        """Reset the graph to empty state"""
-        self.graph.clear()
-        self.draw_empty_graph()
+from search_algorithms.trace import load_trace, TracePlayer
+from utils.graph_io import read_graph, save_csr
+from utils.graph_utils import resolve_node
 
 
 class MainWindow(tk.Tk):
@@ -123,6 +24,13 @@ class MainWindow(tk.Tk):
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
+        # Animation of the running algorithm, if any
+        self.animation = None
+        # Player of the trace being replayed, if any
+        self.replay = None
+        # Algorithm name and SearchStats of the last finished run, if any
+        self.last_stats = None
+
         # Create frames
         self.create_control_panel()
         self.create_visualization_panel()
@@ -148,7 +56,7 @@ class MainWindow(tk.Tk):
         ttk.Label(control_frame, text="Algorithm:").pack(pady=(0, 5))
         self.algorithm_var = tk.StringVar(value="DFS")
         algo_menu = ttk.Combobox(control_frame, textvariable=self.algorithm_var,
-                                 values=["DFS", "UCS", "Tabu Search"])
+                                 values=["DFS", "UCS", "Bidirectional UCS", "A*", "Tabu Search"])
         algo_menu.pack(fill=tk.X, pady=(0, 15))
 
         # Algorithm parameters
@@ -164,21 +72,48 @@ class MainWindow(tk.Tk):
         self.goal_entry = ttk.Entry(param_frame)
         self.goal_entry.grid(row=1, column=1, sticky=tk.EW, pady=2)
 
+        # A* heuristic
+        ttk.Label(param_frame, text="Heuristic:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.heuristic_var = tk.StringVar(value="Landmarks")
+        ttk.Combobox(param_frame, textvariable=self.heuristic_var, state="readonly",
+                     values=["Landmarks", "Euclidean"]).grid(row=2, column=1, sticky=tk.EW, pady=2)
+
         # Tabu Search parameters
-        ttk.Label(param_frame, text="Max Iterations:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        ttk.Label(param_frame, text="Max Iterations:").grid(row=3, column=0, sticky=tk.W, pady=2)
         self.max_iter_entry = ttk.Entry(param_frame)
         self.max_iter_entry.insert(0, "50")
-        self.max_iter_entry.grid(row=2, column=1, sticky=tk.EW, pady=2)
+        self.max_iter_entry.grid(row=3, column=1, sticky=tk.EW, pady=2)
 
-        ttk.Label(param_frame, text="Tabu Size:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        ttk.Label(param_frame, text="Tabu Size:").grid(row=4, column=0, sticky=tk.W, pady=2)
         self.tabu_size_entry = ttk.Entry(param_frame)
         self.tabu_size_entry.insert(0, "10")
-        self.tabu_size_entry.grid(row=3, column=1, sticky=tk.EW, pady=2)
+        self.tabu_size_entry.grid(row=4, column=1, sticky=tk.EW, pady=2)
+
+        ttk.Label(param_frame, text="Neighborhood:").grid(row=5, column=0, sticky=tk.W, pady=2)
+        self.neighborhood_var = tk.StringVar(value="Swap")
+        ttk.Combobox(param_frame, textvariable=self.neighborhood_var, state="readonly",
+                     values=["Swap", "2-opt", "Or-opt"]).grid(row=5, column=1, sticky=tk.EW, pady=2)
+
+        ttk.Label(param_frame, text="Candidates (k):").grid(row=6, column=0, sticky=tk.W, pady=2)
+        self.candidates_entry = ttk.Entry(param_frame)
+        self.candidates_entry.insert(0, "10")
+        self.candidates_entry.grid(row=6, column=1, sticky=tk.EW, pady=2)
+
+        ttk.Label(param_frame, text="Initial Tour:").grid(row=7, column=0, sticky=tk.W, pady=2)
+        self.construction_var = tk.StringVar(value="Random")
+        ttk.Combobox(param_frame, textvariable=self.construction_var, state="readonly",
+                     values=["Random", "Nearest Neighbor", "Greedy", "Space-Filling Curve"]
+                     ).grid(row=7, column=1, sticky=tk.EW, pady=2)
 
         # Speed control
-        ttk.Label(param_frame, text="Animation Speed:").grid(row=4, column=0, sticky=tk.W, pady=2)
+        ttk.Label(param_frame, text="Animation Speed:").grid(row=8, column=0, sticky=tk.W, pady=2)
         self.speed_scale = ttk.Scale(param_frame, from_=0.1, to=1.0, value=0.5)
-        self.speed_scale.grid(row=4, column=1, sticky=tk.EW, pady=2)
+        self.speed_scale.grid(row=8, column=1, sticky=tk.EW, pady=2)
+
+        # Runs are stopped after this many seconds (no limit if empty)
+        ttk.Label(param_frame, text="Timeout (s):").grid(row=9, column=0, sticky=tk.W, pady=2)
+        self.timeout_entry = ttk.Entry(param_frame)
+        self.timeout_entry.grid(row=9, column=1, sticky=tk.EW, pady=2)
 
         param_frame.columnconfigure(1, weight=1)
 
@@ -210,18 +145,60 @@ class MainWindow(tk.Tk):
         # Graph operations
         ttk.Button(graph_frame, text="Clear Graph", command=self.clear_graph).grid(row=3, column=0, columnspan=4,
                                                                                    pady=(10, 0))
+        ttk.Button(graph_frame, text="Import Graph...",
+                   command=self.import_graph).grid(row=4, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
+        ttk.Button(graph_frame, text="Export Graph...",
+                   command=self.export_graph).grid(row=4, column=2, columnspan=2, sticky=tk.EW, pady=(5, 0))
 
         graph_frame.columnconfigure(1, weight=1)
         graph_frame.columnconfigure(3, weight=1)
 
         # Run button
         ttk.Button(control_frame, text="Run Algorithm",
-                   command=self.run_algorithm, style='Accent.TButton').pack(pady=15)
+                   command=self.run_algorithm, style='Accent.TButton').pack(pady=(15, 5))
+
+        # Animation controls
+        animation_frame = ttk.Frame(control_frame)
+        animation_frame.pack(fill=tk.X)
+        ttk.Button(animation_frame, text="Pause/Resume",
+                   command=self.toggle_pause).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        ttk.Button(animation_frame, text="Step",
+                   command=self.step_animation).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        ttk.Button(animation_frame, text="Fast Forward",
+                   command=self.fast_forward).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        ttk.Button(animation_frame, text="Cancel",
+                   command=self.cancel_run).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.explored_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Draw Explored Subgraph Only", variable=self.explored_var,
+                        command=self.toggle_explored_only).pack(fill=tk.X, pady=(5, 0))
+
+        # Trace recording and replay
+        trace_frame = ttk.Frame(control_frame)
+        trace_frame.pack(fill=tk.X, pady=(5, 0))
+        self.record_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(trace_frame, text="Record Trace",
+                        variable=self.record_var).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        ttk.Button(trace_frame, text="Replay Trace...",
+                   command=self.replay_trace).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.seek_scale = ttk.Scale(control_frame, from_=0, to=0, command=self.seek_trace)
+        self.seek_scale.pack(fill=tk.X)
+
+        # Run statistics
+        stats_frame = ttk.Frame(control_frame)
+        stats_frame.pack(fill=tk.X, pady=(5, 0))
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(stats_frame, text="Profile Run",
+                        variable=self.profile_var).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        ttk.Button(stats_frame, text="Export Stats...",
+                   command=self.export_stats).pack(side=tk.LEFT, expand=True, fill=tk.X)
 
         # Status bar
         self.status_var = tk.StringVar(value="Ready")
         ttk.Label(control_frame, textvariable=self.status_var,
                   relief=tk.SUNKEN, anchor=tk.W).pack(fill=tk.X, pady=(10, 0))
+        self.stats_var = tk.StringVar(value="")
+        ttk.Label(control_frame, textvariable=self.stats_var, wraplength=280,
+                  justify=tk.LEFT, anchor=tk.W).pack(fill=tk.X)
 
     def create_visualization_panel(self):
         """Right panel with graph visualization"""
@@ -235,6 +212,7 @@ class MainWindow(tk.Tk):
     def add_node(self):
         node = self.node_entry.get()
         if node:
+            self.stop_run()
             if self.graph_canvas.add_node(node):
                 self.status_var.set(f"Added node: {node}")
                 self.node_entry.delete(0, tk.END)
@@ -252,6 +230,7 @@ class MainWindow(tk.Tk):
 
         try:
             weight = float(weight)
+            self.stop_run()
             if self.graph_canvas.add_edge(from_node, to_node, weight):
                 self.status_var.set(f"Added edge: {from_node} → {to_node} (weight: {weight})")
                 self.from_entry.delete(0, tk.END)
@@ -262,73 +241,285 @@ class MainWindow(tk.Tk):
             messagebox.showerror("Error", "Weight must be a number")
 
     def clear_graph(self):
+        self.stop_run()
         self.graph_canvas.clear_graph()
         self.status_var.set("Graph cleared")
 
+    def import_graph(self):
+        """Load an edge list (CSV/TSV), GraphML or binary graph file, replacing the graph"""
+        path = filedialog.askopenfilename(filetypes=[
+            ("Graph files", "*.csv *.tsv *.txt *.edges *.graphml *.csrg"), ("All files", "*.*")])
+        if not path:
+            return
+        self.status_var.set(f"Importing {path}...")
+        self.update_idletasks()
+        try:
+            csr = read_graph(path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not import {path}: {str(e)}")
+            self.status_var.set("Import failed")
+            return
+        self.stop_run()
+        self.graph_canvas.load_graph(csr)
+        self.status_var.set(f"Imported {len(csr)} nodes and {csr.number_of_edges()} edges")
+
+    def export_graph(self):
+        """Save the graph in the binary format, which loads without parsing"""
+        path = filedialog.asksaveasfilename(defaultextension=".csrg",
+                                            filetypes=[("Binary graphs", "*.csrg")])
+        if not path:
+            return
+        save_csr(self.graph_canvas.snapshot(), path)
+        self.status_var.set(f"Exported graph to {path}")
+
+    def steps_per_second(self):
+        """Animation speed from the slider (the old per-step delay was 0.1-1.0s)"""
+        return 1.0 / (1.1 - self.speed_scale.get())
+
+    def toggle_pause(self):
+        if self.animation is not None:
+            self.animation.toggle_pause()
+
+    def step_animation(self):
+        if self.animation is not None:
+            self.animation.step()
+
+    def fast_forward(self):
+        if self.animation is not None:
+            self.animation.fast_forward()
+
+    def cancel_run(self):
+        if self.animation is not None and not self.animation.done:
+            self.animation.cancel()
+            self.status_var.set("Run cancelled")
+
+    def stop_run(self):
+        """Cancel the run or replay in progress before the graph it draws is changed
+
+        Redrawing the graph resets the surface the run's visualizer draws on.
+        """
+        self.replay = None
+        if self.animation is not None and not self.animation.done:
+            self.animation.cancel()
+
+    def start_animation(self, search, steps, on_done):
+        """Run a search's step generator from the Tk event loop (trace replays)"""
+        if self.animation is not None and not self.animation.done:
+            self.animation.cancel()
+        self.animation = AnimationScheduler(self, search, steps, on_done,
+                                            steps_per_second=self.steps_per_second,
+                                            on_error=self.on_algorithm_error).start()
+
+    def start_worker(self, name, search, steps, on_done, timeout, on_timeout=None):
+        """Run a search's step generator on a background thread, drawing its progress"""
+        if self.animation is not None and not self.animation.done:
+            self.animation.cancel()
+
+        if on_timeout is None:
+            def on_timeout():
+                self.show_stats(name, search.stats)
+                self.status_var.set(f"{name} stopped after the {timeout:g}s timeout")
+
+        self.animation = SearchWorker(self, search, steps, on_done,
+                                      steps_per_second=self.steps_per_second,
+                                      on_error=self.on_algorithm_error,
+                                      on_timeout=on_timeout, timeout=timeout).start()
+
+    def run_timeout(self):
+        """Timeout entry in seconds, None if empty; raises ValueError if invalid"""
+        text = self.timeout_entry.get().strip()
+        if not text:
+            return None
+        timeout = float(text)
+        if timeout <= 0:
+            raise ValueError(text)
+        return timeout
+
+    def replay_trace(self):
+        """Replay a recorded trace on the current graph"""
+        path = filedialog.askopenfilename(filetypes=[("Search traces", "*.trace"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            trace = load_trace(path)
+            player = TracePlayer(trace, self.graph_canvas.model, self.graph_canvas)
+        except Exception as e:
+            self.on_algorithm_error(e)
+            return
+
+        self.replay = None  # Don't seek while the slider is reset
+        self.seek_scale.configure(to=max(len(trace) - 1, 0))
+        self.seek_scale.set(0)
+        self.replay = player
+        self.status_var.set(f"Replaying {trace.meta['algorithm']} trace ({len(trace)} steps)...")
+        self.start_animation(player, player.steps(), self.on_replay_done)
+
+    def seek_trace(self, value):
+        """Jump the replay to the slider position and pause there"""
+        if self.replay is None:
+            return
+        step = int(float(value))
+        self.start_animation(self.replay, self.replay.steps(step + 1), self.on_replay_done)
+        self.animation.pause()
+        self.status_var.set(f"Replay paused at step {step}")
+
+    def on_replay_done(self, result):
+        if self.replay is not None:
+            self.show_stats(f"{self.replay.trace.meta['algorithm']} replay", self.replay.stats)
+        if result:
+            self.status_var.set(f"Replay finished: {' → '.join(map(str, result))}")
+        else:
+            self.status_var.set("Replay finished")
+
+    def toggle_explored_only(self):
+        """Have the next search draw only the nodes and edges it explores"""
+        self.graph_canvas.explored_only = self.explored_var.get()
+
+    def trace_path(self):
+        """Ask where to record the next run, if recording is enabled (empty if cancelled)"""
+        if not self.record_var.get():
+            return None
+        return filedialog.asksaveasfilename(defaultextension=".trace",
+                                            filetypes=[("Search traces", "*.trace")])
+
+    def profile_path(self):
+        """Ask where to save the next run's cProfile stats, if profiling is enabled"""
+        if not self.profile_var.get():
+            return None
+        return filedialog.asksaveasfilename(defaultextension=".prof",
+                                            filetypes=[("Profile stats", "*.prof")])
+
+    def show_stats(self, name, stats):
+        """Show a run's counters and time split under the status bar"""
+        self.last_stats = (name, stats)
+        self.stats_var.set(f"{name}: {stats.summary()}")
+
+    def export_stats(self):
+        """Save the last run's counters and timers as JSON"""
+        if self.last_stats is None:
+            messagebox.showinfo("Export Stats", "No finished run to export")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        name, stats = self.last_stats
+        stats.save(path, algorithm=name)
+        self.status_var.set(f"Exported stats to {path}")
+
+    def on_algorithm_error(self, error):
+        messagebox.showerror("Error", f"An error occurred: {str(error)}")
+        self.status_var.set("Error during execution")
+
     def run_algorithm(self):
         algorithm = self.algorithm_var.get()
-        delay = 1.1 - self.speed_scale.get()  # Convert to delay (0.1-1.0s)
 
         try:
-            if algorithm in ["DFS", "UCS"]:
+            if algorithm in ["DFS", "UCS", "Bidirectional UCS", "A*"]:
                 start = self.start_entry.get()
                 goal = self.goal_entry.get()
 
                 if not start or not goal:
                     messagebox.showerror("Error", "Please specify both start and goal nodes")
                     return
+                try:
+                    timeout = self.run_timeout()
+                except ValueError:
+                    messagebox.showerror("Error", "Timeout must be a positive number of seconds")
+                    return
 
-                if start not in self.graph_canvas.graph.nodes() or goal not in self.graph_canvas.graph.nodes():
+                # Imported graphs are searched as loaded, without converting them again
+                graph = self.graph_canvas.snapshot()
+                try:
+                    start, goal = resolve_node(graph, start), resolve_node(graph, goal)
+                except ValueError:
                     messagebox.showerror("Error", "Start or goal node not in graph")
                     return
 
+                trace = self.trace_path()
+                if trace is not None and not trace:
+                    return
+                profile = self.profile_path()
+                if profile is not None and not profile:
+                    return
+                self.replay = None
                 self.status_var.set(f"Running {algorithm} from {start} to {goal}...")
-                self.update()
 
                 if algorithm == "DFS":
-                    dfs = DFS(self.graph_canvas.graph, self.graph_canvas)
-                    path = dfs.search(start, goal, delay)
-                else:  # UCS
-                    ucs = UCS(self.graph_canvas.graph, self.graph_canvas)
-                    path = ucs.search(start, goal, delay)
-
-                if path:
-                    self.status_var.set(f"{algorithm} found path: {' → '.join(path)}")
-                else:
-                    self.status_var.set(f"{algorithm} found no path")
+                    search = DFS(graph, self.graph_canvas)
+                elif algorithm == "UCS":
+                    search = UCS(graph, self.graph_canvas)
+                elif algorithm == "Bidirectional UCS":
+                    search = BidirectionalUCS(graph, self.graph_canvas)
+                else:  # A*
+                    search = AStar(graph, self.graph_canvas,
+                                   heuristic=self.heuristic_var.get().lower())
+                if profile:
+                    search.stats.profile(profile)
+
+                def on_done(path):
+                    self.show_stats(algorithm, search.stats)
+                    if path:
+                        self.status_var.set(f"{algorithm} found path: {' → '.join(map(str, path))}")
+                    else:
+                        self.status_var.set(f"{algorithm} found no path")
+
+                self.start_worker(algorithm, search, search.steps(start, goal, trace=trace), on_done, timeout)
 
             elif algorithm == "Tabu Search":
                 try:
                     max_iter = int(self.max_iter_entry.get())
                     tabu_size = int(self.tabu_size_entry.get())
+                    candidates = int(self.candidates_entry.get())
+                except ValueError:
+                    messagebox.showerror("Error", "Iterations, Tabu Size and Candidates must be integers")
+                    return
+                try:
+                    timeout = self.run_timeout()
                 except ValueError:
-                    messagebox.showerror("Error", "Iterations and Tabu Size must be integers")
+                    messagebox.showerror("Error", "Timeout must be a positive number of seconds")
                     return
 
-                if len(self.graph_canvas.graph.nodes()) < 3:
+                if len(self.graph_canvas.model) < 3:
                     messagebox.showerror("Error", "Tabu Search requires at least 3 nodes")
                     return
 
+                trace = self.trace_path()
+                if trace is not None and not trace:
+                    return
+                profile = self.profile_path()
+                if profile is not None and not profile:
+                    return
+                self.replay = None
                 self.status_var.set("Running Tabu Search...")
-                self.update()
 
                 tabu = TabuSearch(
-                    graph=self.graph_canvas.graph,
+                    graph=self.graph_canvas.snapshot(),
                     canvas=self.graph_canvas,
                     max_iter=max_iter,
-                    tabu_size=tabu_size
+                    tabu_size=tabu_size,
+                    neighborhood=self.neighborhood_var.get().lower(),
+                    candidates=candidates,
+                    construction=self.construction_var.get().lower().replace(' ', '-')
                 )
-                best_solution = tabu.search(delay)
+                if profile:
+                    tabu.stats.profile(profile)
+
+                def on_done(best_solution, outcome="Best solution found"):
+                    self.show_stats(algorithm, tabu.stats)
+                    if best_solution:
+                        cost = tabu.calculate_cost(best_solution)
+                        self.status_var.set(f"{outcome} (cost: {cost:.2f}): {' → '.join(map(str, best_solution))}")
+                    else:
+                        self.status_var.set("Tabu Search completed")
+
+                def on_timeout():
+                    # Time spent paused does not count, as for the other searches
+                    on_done(tabu.best_solution, f"Best solution after the {timeout:g}s timeout")
 
-                if best_solution:
-                    cost = tabu.calculate_cost(best_solution)
-                    self.status_var.set(f"Best solution found (cost: {cost:.2f}): {' → '.join(best_solution)}")
-                else:
-                    self.status_var.set("Tabu Search completed")
+                self.start_worker(algorithm, tabu, tabu.steps(trace=trace), on_done, timeout, on_timeout)
 
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            self.status_var.set("Error during execution")
+            self.on_algorithm_error(e)
 
 
 if __name__ == "__main__":
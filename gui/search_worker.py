@@ -0,0 +1,263 @@
+import queue
+import threading
+import time
+
+
+class SearchWorker:
+    """Run a search's step generator on a background thread
+
+    The thread runs steps at steps_per_second (as fast as it can in
+    fast-forward mode) and hands their events to the Tk thread through a
+    queue, batched so that at most one message is posted per
+    snapshot_interval. The Tk thread polls the queue with after(), emits the
+    events to the search's listeners and renders one frame per poll, so the
+    window keeps redrawing and stays responsive however long the search
+    runs. The queue is bounded: a search that outruns the drawing waits for
+    it instead of piling up events.
+
+    cancel() and the timeout (in seconds of running time, pauses excluded)
+    stop the search between two steps; its generator is closed on the
+    worker thread, so the search's cleanup runs as on any other early exit.
+    The controls match AnimationScheduler's, so the window drives either.
+    """
+
+    def __init__(self, widget, search, steps, on_done, steps_per_second=lambda: 2.0, on_error=None,
+                 on_timeout=None, timeout=None, snapshot_interval=0.1, poll_interval=1 / 30, max_pending=8):
+        self.widget = widget
+        self.search = search
+        self.steps = steps
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_timeout = on_timeout
+        self.steps_per_second = steps_per_second
+        self.timeout = timeout
+        self.snapshot_interval = snapshot_interval
+        self.poll_interval = poll_interval
+
+        # Set by the Tk thread, read by the worker between steps
+        self.paused = False
+        self.fast = False
+        self.rate = steps_per_second()
+        # Single steps asked for by step(); both threads change the count
+        self._single_steps = 0
+        self._steps_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+        self.done = False
+        self.cancelled = False
+        self.timed_out = False
+        self.result = None
+        self.step_count = 0
+        self.frames = 0
+        self._queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, name="search-worker", daemon=True)
+        self._job = None
+
+    def start(self):
+        self._thread.start()
+        self._schedule()
+        return self
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        if self.done or not self.paused:
+            return
+        self.paused = False
+        self._wake.set()
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def step(self):
+        """Advance a single search step (pauses the run)"""
+        self.pause()
+        if not self.done:
+            with self._steps_lock:
+                self._single_steps += 1
+            self._wake.set()
+
+    def fast_forward(self, enabled=True):
+        self.fast = enabled
+        if self.paused:
+            self.resume()
+        self._wake.set()
+
+    def cancel(self):
+        """Stop the run without calling on_done; the worker exits after its current step"""
+        self.done = self.cancelled = True
+        self._stop.set()
+        self._wake.set()
+
+    def join(self, timeout=None):
+        """Wait for the worker thread to exit"""
+        self._thread.join(timeout)
+
+    # Worker thread
+
+    def _post(self, message):
+        # Waits while the Tk thread is behind, unless the run is cancelled
+        while not self._stop.is_set():
+            try:
+                self._queue.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _flush(self, batch, search_time, sleep_time):
+        """Post the batched events and add up the time they took; returns a new batch"""
+        stats = self.search.stats
+        stats.add_time('search', search_time)
+        stats.add_time('sleep', sleep_time)
+        if batch:
+            self._post(('steps', batch))
+        return []
+
+    def _take_single_step(self):
+        """Use up one of the requested single steps, if any is left"""
+        with self._steps_lock:
+            if not self._single_steps:
+                return False
+            self._single_steps -= 1
+            return True
+
+    def _wait(self, seconds):
+        """Sleep until woken by a control or the time is up; returns the time slept"""
+        started = time.perf_counter()
+        if self._wake.wait(seconds):
+            self._wake.clear()
+        return time.perf_counter() - started
+
+    def _run(self):
+        stats, clock = self.search.stats, time.perf_counter
+        batch = []
+        posted = clock()
+        search_time = sleep_time = paused_time = 0.0
+        credit = 0.0
+        last = started = clock()
+        outcome = ('cancelled', None)
+        try:
+            with stats.profiling():
+                while not self._stop.is_set():
+                    now = clock()
+                    if self.timeout is not None and now - started - paused_time > self.timeout:
+                        outcome = ('timeout', None)
+                        break
+                    single = self._take_single_step()
+                    if self.paused and not single:
+                        # Going idle: show what ran so far right away
+                        batch = self._flush(batch, search_time, sleep_time)
+                        search_time = sleep_time = 0.0
+                        paused_time += self._wait(0.1)
+                        last = clock()
+                        continue
+                    if not single and not self.fast:
+                        credit = min(credit + (now - last) * max(self.rate, 0.0), 1.0)
+                        last = now
+                        if credit < 1.0:
+                            # Sleep until the next step is due, waking up for controls
+                            batch = self._flush(batch, search_time, sleep_time)
+                            search_time = sleep_time = 0.0
+                            posted = clock()
+                            rate = max(self.rate, 0.1)
+                            sleep_time += self._wait(min((1.0 - credit) / rate, self.snapshot_interval))
+                            continue
+                        credit -= 1.0
+
+                    stepped = clock()
+                    try:
+                        batch.append(next(self.steps))
+                    except StopIteration as stop:
+                        outcome = ('done', stop.value)
+                        break
+                    finally:
+                        search_time += clock() - stepped
+                    if clock() - posted >= self.snapshot_interval:
+                        batch = self._flush(batch, search_time, sleep_time)
+                        search_time = sleep_time = 0.0
+                        posted = clock()
+        except Exception as error:
+            outcome = ('error', error)
+        finally:
+            if outcome[0] != 'done':
+                self.steps.close()
+            self._flush(batch, search_time, sleep_time)
+            # The Tk thread polls until it gets this, even after cancel()
+            self._queue.put(outcome)
+
+    # Tk thread
+
+    def _schedule(self):
+        self._job = self.widget.after(max(int(self.poll_interval * 1000), 1), self._poll)
+
+    def _poll(self):
+        """Take the worker's messages, emit their events and draw one frame"""
+        self._job = None
+        self.rate = self.steps_per_second()
+        stats = self.search.stats
+        emitted = False
+        finished = None
+        try:
+            while finished is None:
+                try:
+                    kind, value = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'steps':
+                    if not self.cancelled:
+                        with stats.timer('render'):
+                            for event in value:
+                                self.search.emit(event)
+                        self.step_count += len(value)
+                        emitted = True
+                else:
+                    finished = kind, value
+            if finished is None and emitted:
+                self._render()
+        except Exception as error:
+            # Drawing failed: stop the run, but keep draining the queue until the worker exits
+            self.cancel()
+            self._schedule()
+            self._fail(error)
+            return
+
+        if finished is None:
+            self._schedule()
+            return
+
+        kind, value = finished
+        self.done = True
+        stats.stop()
+        if self.cancelled:
+            return
+        if kind == 'error':
+            self._fail(value)
+            return
+        try:
+            self._render()
+        except Exception as error:
+            self._fail(error)
+            return
+        if kind == 'done':
+            self.result = value
+            self.on_done(value)
+        elif kind == 'timeout':
+            self.timed_out = True
+            if self.on_timeout is not None:
+                self.on_timeout()
+
+    def _fail(self, error):
+        if self.on_error is None:
+            raise error
+        self.on_error(error)
+
+    def _render(self):
+        visualizer = self.search.visualizer
+        if visualizer is not None:
+            visualizer.render()
+            self.frames += 1
@@ -1,5 +1,11 @@
-from gui.main_window import MainWindow
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Batch queries run headless, without importing Tk
+        from cli import main
+        sys.exit(main())
+
+    from gui.main_window import MainWindow
     app = MainWindow()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
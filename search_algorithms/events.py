@@ -0,0 +1,54 @@
+import time
+from collections import namedtuple
+from .stats import SearchStats
+
+# One node expansion of DFS/UCS. For DFS the cost is the path depth.
+SearchStep = namedtuple('SearchStep', ['step', 'node', 'frontier_size', 'cost', 'path'])
+
+# One Tabu Search iteration
+TabuStep = namedtuple('TabuStep', ['iteration', 'current_solution', 'best_solution',
+                                   'tabu_moves', 'current_cost', 'best_cost'])
+
+
+class EventSource:
+    """Base for searches that publish step events to subscribed listeners"""
+
+    def __init__(self):
+        self.listeners = []
+        self.visualizer = None
+        self.stats = SearchStats()
+
+    def subscribe(self, listener):
+        """Call listener(event) for every step of later runs"""
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def emit(self, event):
+        for listener in self.listeners:
+            listener(event)
+
+    def run_steps(self, steps, delay=0):
+        """Drive a step generator to completion and return its result"""
+        stats, clock = self.stats, time.perf_counter
+        try:
+            with stats.profiling():
+                while True:
+                    started = clock()
+                    try:
+                        event = next(steps)
+                    except StopIteration as stop:
+                        stats.add_time('search', clock() - started)
+                        return stop.value
+                    stepped = clock()
+                    stats.add_time('search', stepped - started)
+                    self.emit(event)
+                    stats.add_time('render', clock() - stepped)
+                    if self.visualizer is not None:
+                        self.visualizer.refresh()
+                    if delay:
+                        with stats.timer('sleep'):
+                            time.sleep(delay)  # Pause to see the progress
+        finally:
+            stats.stop()
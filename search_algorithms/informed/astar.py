@@ -0,0 +1,36 @@
+from ..uninformed.ucs import UCS
+from .heuristics import EuclideanHeuristic, LandmarkHeuristic
+
+
+class AStar(UCS):
+    """UCS ordered by cost + heuristic estimate of the remaining cost
+
+    heuristic is 'landmarks', 'euclidean' or an object with a table(goal_id)
+    method. Euclidean distances use pos, falling back to the visualizer layout.
+    max_cost bounds the cost + estimate of expanded nodes, as in UCS.
+
+    The heuristic is built by the first search, inside steps() (so on the
+    GUI's worker thread, not in the constructor). Landmark tables are kept in
+    the cache (the canvas' path_cache) for later searches on the same graph.
+    """
+
+    def __init__(self, graph, canvas=None, heuristic='landmarks', pos=None, max_cost=None, cache=None):
+        super().__init__(graph, canvas, cache=cache, max_cost=max_cost)
+        if self.csr is None:
+            raise ValueError("A* needs an explicit graph for its heuristic tables")
+        if heuristic == 'euclidean' and pos is None:
+            if self.visualizer is None:
+                raise ValueError("Euclidean heuristic needs node positions")
+            pos = self.visualizer.pos
+        self.heuristic = heuristic
+        self.pos = pos
+
+    def heuristic_table(self, goal_id):
+        if self.heuristic == 'landmarks':
+            if self.cache is not None:
+                self.heuristic = self.cache.table(self.csr, 'landmarks', LandmarkHeuristic)
+            else:
+                self.heuristic = LandmarkHeuristic(self.csr)
+        elif self.heuristic == 'euclidean':
+            self.heuristic = EuclideanHeuristic(self.csr, self.pos)
+        return self.heuristic.table(goal_id)
@@ -0,0 +1,66 @@
+import random
+import numpy as np
+from ..uninformed.frontier import single_source_costs
+
+
+class EuclideanHeuristic:
+    """Straight-line distance between node coordinates
+
+    Layout coordinates are not in edge-weight units, so distances are scaled by
+    the smallest weight/length ratio over all edges. That keeps the estimate
+    admissible and consistent for any layout.
+    """
+
+    def __init__(self, csr, pos):
+        self.coords = np.array([pos[node] for node in csr.nodes], dtype=float)
+        offsets, targets, weights = csr.as_numpy()
+        sources = np.repeat(np.arange(len(csr)), np.diff(offsets))
+        lengths = np.linalg.norm(self.coords[sources] - self.coords[targets], axis=1)
+        mask = lengths > 0
+        scale = np.min(weights[mask] / lengths[mask]) if mask.any() else 0.0
+        self.scale = max(float(scale), 0.0)
+
+    def table(self, goal):
+        """Return the estimate for every node as a list indexed by node ID"""
+        distances = np.linalg.norm(self.coords - self.coords[goal], axis=1)
+        return (distances * self.scale).tolist()
+
+
+class LandmarkHeuristic:
+    """ALT lower bounds from precomputed landmark distance tables
+
+    By the triangle inequality d(v, goal) >= |d(L, v) - d(L, goal)| for every
+    landmark L of an undirected graph (only d(L, goal) - d(L, v) for directed
+    ones). Landmarks are picked by farthest-point selection.
+    """
+
+    def __init__(self, csr, landmarks=4, seed=None):
+        self.directed = csr.directed
+        rng = random.Random(seed)
+        chosen = [rng.randrange(len(csr))]
+        tables = [np.frombuffer(single_source_costs(csr, chosen[0]), dtype=np.float64)]
+        nearest = tables[0].copy()
+        while len(chosen) < min(landmarks, len(csr)):
+            # Unreachable nodes come first so every component gets a landmark
+            spread = np.where(np.isinf(nearest), np.finfo(float).max, nearest)
+            spread[chosen] = -1
+            landmark = int(np.argmax(spread))
+            chosen.append(landmark)
+            tables.append(np.frombuffer(single_source_costs(csr, landmark), dtype=np.float64))
+            nearest = np.minimum(nearest, tables[-1])
+        self.landmarks = chosen
+        self.distances = np.vstack(tables)
+
+    def table(self, goal):
+        """Return the estimate for every node as a list indexed by node ID"""
+        d = self.distances
+        to_goal = d[:, goal:goal + 1]
+        # inf - inf is NaN for landmarks reaching neither end; masked below
+        with np.errstate(invalid='ignore'):
+            if self.directed:
+                bounds = to_goal - d
+            else:
+                bounds = np.abs(d - to_goal)
+        # A landmark that cannot reach both ends says nothing about this pair
+        bounds[~(np.isfinite(d) & np.isfinite(to_goal))] = 0
+        return np.maximum(bounds.max(axis=0), 0).tolist()
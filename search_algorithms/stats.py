@@ -0,0 +1,118 @@
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+
+
+class SearchStats:
+    """Counters and timers of a search run
+
+    The searches fill in the counters; the drivers (EventSource.run_steps and
+    the GUI's AnimationScheduler) and the visualizers add up where the time
+    went: stepping the search, rendering, computing the layout and sleeping
+    between steps. Layout is computed when the visualizer is built, before
+    the run starts, so its time is kept across reset() and is not part of
+    the run's wall time. Tabu Search also times building its initial tour,
+    which is part of the search time.
+    """
+
+    COUNTERS = ('expansions', 'pushes', 'peak_frontier', 'stale_pops', 'iterations', 'neighbors_evaluated',
+                'states', 'restarts', 'initial_cost')
+    TIMERS = ('search', 'render', 'layout', 'sleep', 'construction')
+
+    def __init__(self):
+        self.times = dict.fromkeys(self.TIMERS, 0.0)
+        self.profiler = None
+        self.profile_path = None
+        self.reset()
+
+    def reset(self):
+        """Start a new run"""
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        for name in self.TIMERS:
+            if name != 'layout':
+                self.times[name] = 0.0
+        self.started = time.perf_counter()
+        self.stopped = None
+
+    def add_time(self, name, seconds):
+        self.times[name] += seconds
+
+    @contextmanager
+    def timer(self, name):
+        """Add the time spent in the block to the named timer"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += time.perf_counter() - started
+
+    def profile(self, path):
+        """Profile the next run with cProfile and write its stats to path"""
+        self.profiler = cProfile.Profile()
+        self.profile_path = path
+
+    @contextmanager
+    def profiling(self):
+        """Enable the profiler, if one is set, for the block"""
+        profiler = self.profiler
+        if profiler is None:
+            yield
+            return
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+    def stop(self):
+        """End the run and write the profile, if one was taken"""
+        if self.stopped is None:
+            self.stopped = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.disable()  # stop() may run inside profiling()
+            self.profiler.dump_stats(self.profile_path)
+            self.profiler = None
+
+    @property
+    def wall(self):
+        return (self.stopped or time.perf_counter()) - self.started
+
+    def to_dict(self):
+        result = {name: getattr(self, name) for name in self.COUNTERS}
+        result.update({name + '_seconds': seconds for name, seconds in self.times.items()})
+        result['wall_seconds'] = self.wall
+        return result
+
+    def save(self, path, **extra):
+        """Write the stats (and any extra fields) as JSON"""
+        with open(path, 'w') as f:
+            json.dump(dict(extra, **self.to_dict()), f, indent=2)
+
+    def summary(self):
+        """One line summary of the non-zero counters and the time split"""
+        parts = []
+        if self.expansions:
+            parts.append(f"{self.expansions} expanded")
+        if self.pushes:
+            parts.append(f"{self.pushes} pushed")
+        if self.peak_frontier:
+            parts.append(f"frontier peak {self.peak_frontier}")
+        if self.stale_pops:
+            parts.append(f"{self.stale_pops} stale pops")
+        if self.states:
+            parts.append(f"{self.states} states stored")
+        if self.iterations:
+            parts.append(f"{self.iterations} iterations, "
+                         f"{self.neighbors_evaluated / self.iterations:.0f} neighbors/iteration")
+        if self.restarts:
+            parts.append(f"{self.restarts} restarts")
+        if self.initial_cost:
+            parts.append(f"initial tour cost {self.initial_cost:.2f} built in "
+                         f"{self.times['construction']:.3f}s of the search time")
+        times = ", ".join(f"{name} {self.times[name]:.2f}s" for name in ('search', 'render', 'sleep'))
+        parts.append(f"{times} of {self.wall:.2f}s")
+        if self.times['layout']:
+            parts.append(f"layout {self.times['layout']:.2f}s before the run")
+        return "; ".join(parts)
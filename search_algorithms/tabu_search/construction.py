@@ -0,0 +1,117 @@
+import numpy as np
+
+
+def nearest_neighbor_tour(dist, candidates=None, start=0):
+    """Tour that always moves on to the closest unvisited city
+
+    The next city is looked up in the current city's candidate list (an
+    n x k array sorted by weight, see nearest_candidates) and only when all
+    of those are visited in the city's whole row of the weight matrix.
+    """
+    n = len(dist)
+    near = candidates.tolist() if candidates is not None else [[]] * n
+    visited = np.zeros(n, dtype=bool)
+    seen = [False] * n
+    tour = np.empty(n, dtype=np.int64)
+    city = start
+    for position in range(n):
+        tour[position] = city
+        visited[city] = seen[city] = True
+        if position == n - 1:
+            break
+        for neighbor in near[city]:
+            if not seen[neighbor]:
+                city = neighbor
+                break
+        else:
+            city = int(np.argmin(np.where(visited, np.inf, dist[city])))
+    return tour
+
+
+def greedy_edge_tour(dist, candidates):
+    """Tour built from the cheapest edges that keep it a set of paths
+
+    Candidate edges are taken cheapest first, skipping any that would give
+    a city a third edge or close a cycle. The paths left over are then
+    chained, each to the path whose end is closest to the last one's end.
+    """
+    n = len(dist)
+    sources = np.repeat(np.arange(n), candidates.shape[1])
+    targets = candidates.ravel()
+    keys = np.unique(np.minimum(sources, targets) * n + np.maximum(sources, targets))
+    sources, targets = np.divmod(keys, n)
+    order = np.argsort(dist[sources, targets], kind='stable')
+
+    parent = list(range(n))
+
+    def find(city):
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]
+            city = parent[city]
+        return city
+
+    links = [[] for _ in range(n)]
+    for u, v in zip(sources[order].tolist(), targets[order].tolist()):
+        if len(links[u]) < 2 and len(links[v]) < 2:
+            root_u, root_v = find(u), find(v)
+            if root_u != root_v:
+                parent[root_u] = root_v
+                links[u].append(v)
+                links[v].append(u)
+
+    # Every path from each of its ends (a lone city is a path of its own)
+    paths = {}
+    for end in range(n):
+        if len(links[end]) < 2 and end not in paths:
+            path, previous, city = [end], -1, end
+            while True:
+                following = [neighbor for neighbor in links[city] if neighbor != previous]
+                if not following:
+                    break
+                previous, city = city, following[0]
+                path.append(city)
+            paths[end] = path
+            paths[path[-1]] = path[::-1]
+
+    ends = np.array(list(paths), dtype=np.int64)
+    index = {end: i for i, end in enumerate(ends.tolist())}
+    open_ends = np.ones(len(ends), dtype=bool)
+    tour = []
+    end = int(ends[0])
+    while True:
+        path = paths[end]
+        open_ends[index[path[0]]] = open_ends[index[path[-1]]] = False
+        tour.extend(path)
+        if not open_ends.any():
+            break
+        end = int(ends[np.argmin(np.where(open_ends, dist[path[-1], ends], np.inf))])
+    return np.array(tour, dtype=np.int64)
+
+
+def hilbert_index(coords, bits=16):
+    """Position of every point along a Hilbert curve over their bounding box"""
+    low = coords.min(axis=0)
+    span = max(float((coords.max(axis=0) - low).max()), 1e-12)
+    side = 1 << bits
+    grid = ((coords - low) / span * (side - 1)).astype(np.int64)
+    x, y = grid[:, 0], grid[:, 1]
+    index = np.zeros(len(coords), dtype=np.int64)
+    s = side >> 1
+    while s:
+        rx, ry = (x & s) > 0, (y & s) > 0
+        index += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve inside it starts and ends right
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return index
+
+
+def space_filling_curve_tour(coords):
+    """Cities in the order a Hilbert curve through their coordinates visits them"""
+    return np.argsort(hilbert_index(np.asarray(coords, dtype=float)), kind='stable').astype(np.int64)
+
+
+CONSTRUCTIONS = ('random', 'nearest-neighbor', 'greedy', 'space-filling-curve')
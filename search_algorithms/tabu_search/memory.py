@@ -0,0 +1,59 @@
+from collections import deque
+import numpy as np
+
+
+class TabuMemory:
+    """Attribute-based tabu memory with expiry tenure
+
+    Move attributes are unordered city pairs. Marking a pair tabu stores the
+    iteration at which it expires in a dict keyed by the pair, and advance()
+    drops the pairs whose expiry iteration has passed, so memory stays
+    O(tenure) whatever the number of cities. Membership over whole
+    neighborhoods is one vectorized lookup in the live keys.
+    """
+
+    def __init__(self, size, tenure):
+        self.size = size
+        self.tenure = tenure
+        self.iteration = 0
+        self.expires = {}
+        self._active = deque()
+        self._keys = None
+
+    def key(self, a, b):
+        """Key of the unordered pair (a, b); a and b may be arrays of cities"""
+        return np.minimum(a, b) * self.size + np.maximum(a, b)
+
+    def add(self, a, b):
+        """Make the pair (a, b) tabu for the next tenure iterations"""
+        expiry = self.iteration + self.tenure + 1
+        self.expires[int(self.key(a, b))] = expiry
+        self._active.append((a, b, expiry))
+        self._keys = None
+
+    def is_tabu(self, a, b):
+        """Whether pair (a, b) is tabu; a and b may be arrays of cities"""
+        if self._keys is None:
+            self._keys = np.fromiter(self.expires, dtype=np.int64, count=len(self.expires))
+        return np.isin(self.key(np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64)),
+                       self._keys)
+
+    def advance(self):
+        """Move to the next iteration, expiring attributes whose tenure ran out"""
+        self.iteration += 1
+        active, expires = self._active, self.expires
+        while active and active[0][2] <= self.iteration:
+            a, b, expiry = active.popleft()
+            key = int(self.key(a, b))
+            # A pair marked again since keeps its later expiry
+            if expires.get(key) == expiry:
+                del expires[key]
+            self._keys = None
+
+    def active(self):
+        """Compact view of the tabu attributes as (a, b) pairs"""
+        return [(a, b) for a, b, expiry in self._active
+                if self.expires.get(int(self.key(a, b))) == expiry]
+
+    def __len__(self):
+        return len(self.expires)
@@ -0,0 +1,211 @@
+import numpy as np
+
+
+def tour_cost(dist, tour):
+    """Cost of the closed tour (an array of node IDs) under a dense weight matrix"""
+    return float(dist[tour, np.roll(tour, -1)].sum())
+
+
+def swap_pairs(n):
+    """Position pairs (i < j) of the full pairwise swap neighborhood"""
+    return np.triu_indices(n, 1)
+
+
+def swap_deltas(dist, tour, i, j):
+    """Cost change of swapping positions i[k] < j[k] of the tour, for every k
+
+    Only the (at most four) edges around the two positions change, so each
+    move is scored in O(1) without building the swapped tour.
+    """
+    n = len(tour)
+    if n < 3:
+        cost = tour_cost(dist, tour)
+        return np.array([tour_cost(dist, apply_swap(tour, a, b)) - cost for a, b in zip(i, j)])
+
+    a, b = tour[i], tour[j]
+    prev_a, next_a = tour[i - 1], tour[(i + 1) % n]
+    prev_b, next_b = tour[j - 1], tour[(j + 1) % n]
+    delta = (dist[prev_a, b] + dist[b, next_a] + dist[prev_b, a] + dist[a, next_b]
+             - dist[prev_a, a] - dist[a, next_a] - dist[prev_b, b] - dist[b, next_b])
+
+    # Neighbouring positions share an edge, which the formula above double counts
+    adjacent = j == i + 1
+    pa, aa, ba, nb = prev_a[adjacent], a[adjacent], b[adjacent], next_b[adjacent]
+    delta[adjacent] = (dist[pa, ba] + dist[ba, aa] + dist[aa, nb]
+                       - dist[pa, aa] - dist[aa, ba] - dist[ba, nb])
+    wrapped = (i == 0) & (j == n - 1)
+    pb, aw, bw, na = prev_b[wrapped], a[wrapped], b[wrapped], next_a[wrapped]
+    delta[wrapped] = (dist[pb, aw] + dist[aw, bw] + dist[bw, na]
+                      - dist[pb, bw] - dist[bw, aw] - dist[aw, na])
+    return delta
+
+
+def apply_swap(tour, i, j):
+    """Return a copy of the tour with positions i and j swapped"""
+    neighbor = tour.copy()
+    neighbor[i], neighbor[j] = tour[j], tour[i]
+    return neighbor
+
+
+def nearest_candidates(dist, k):
+    """The k cheapest other cities of every city, as an n x k array sorted by weight"""
+    n = len(dist)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64)
+    d = dist.copy()
+    np.fill_diagonal(d, np.inf)
+    nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(d, nearest, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def tour_positions(tour):
+    """Position of every city in the tour"""
+    position = np.empty(len(tour), dtype=np.int64)
+    position[tour] = np.arange(len(tour))
+    return position
+
+
+def _candidate_pairs(tour, candidates):
+    """Positions (i, j) of every city and each of its candidate cities"""
+    n, k = candidates.shape
+    position = tour_positions(tour)
+    cities = np.repeat(np.arange(n), k)
+    return position[cities], position[candidates.ravel()]
+
+
+class SwapNeighborhood:
+    """Exchange the positions of two cities
+
+    Moves are (i, j, 0) with i < j; the swapped city pair is the tabu attribute.
+    Without candidate lists every pair of positions is tried.
+    """
+
+    name = 'swap'
+
+    def evaluate(self, dist, tour, candidates=None):
+        """Return (moves, deltas) for the tour"""
+        if candidates is None or candidates.shape[1] >= len(tour) - 1:
+            i, j = swap_pairs(len(tour))
+        else:
+            a, b = _candidate_pairs(tour, candidates)
+            i, j = np.minimum(a, b), np.maximum(a, b)
+        moves = np.column_stack((i, j, np.zeros_like(i)))
+        return moves, swap_deltas(dist, tour, i, j)
+
+    def is_tabu(self, memory, tour, moves):
+        return memory.is_tabu(tour[moves[:, 0]], tour[moves[:, 1]])
+
+    def mark(self, memory, tour, move):
+        memory.add(tour[move[0]], tour[move[1]])
+
+    def apply(self, tour, move):
+        return apply_swap(tour, move[0], move[1])
+
+
+class TwoOptNeighborhood:
+    """Replace edges (t[i], t[i+1]) and (t[j], t[j+1]) by reversing t[i+1..j]
+
+    Moves are (i, j, 0) with i < j. Removed edges become tabu and a move is
+    tabu if it would add one back. Assumes symmetric weights.
+    """
+
+    name = '2-opt'
+
+    def evaluate(self, dist, tour, candidates=None):
+        n = len(tour)
+        if candidates is None:
+            candidates = nearest_candidates(dist, n - 1)
+        a, b = _candidate_pairs(tour, candidates)
+        # New edge (t[a], t[b]) either after both cities or before both
+        a, b = np.concatenate((a, (a - 1) % n)), np.concatenate((b, (b - 1) % n))
+        i, j = np.minimum(a, b), np.maximum(a, b)
+        valid = (j - i >= 2) & ~((i == 0) & (j == n - 1))
+        i, j = i[valid], j[valid]
+        ti, tj = tour[i], tour[j]
+        ti_next, tj_next = tour[i + 1], tour[(j + 1) % n]
+        deltas = dist[ti, tj] + dist[ti_next, tj_next] - dist[ti, ti_next] - dist[tj, tj_next]
+        return np.column_stack((i, j, np.zeros_like(i))), deltas
+
+    def is_tabu(self, memory, tour, moves):
+        n = len(tour)
+        i, j = moves[:, 0], moves[:, 1]
+        return (memory.is_tabu(tour[i], tour[j])
+                | memory.is_tabu(tour[i + 1], tour[(j + 1) % n]))
+
+    def mark(self, memory, tour, move):
+        i, j = move[0], move[1]
+        memory.add(tour[i], tour[i + 1])
+        memory.add(tour[j], tour[(j + 1) % len(tour)])
+
+    def apply(self, tour, move):
+        i, j = move[0], move[1]
+        neighbor = tour.copy()
+        neighbor[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+        return neighbor
+
+
+class OrOptNeighborhood:
+    """Move a segment of 1-3 consecutive cities to another place in the tour
+
+    Moves are (i, length, g): the segment starting at position i is reinserted
+    after the city at position g. Removed edges become tabu and a move is tabu
+    if it would add one back.
+    """
+
+    name = 'or-opt'
+    max_segment = 3
+
+    def evaluate(self, dist, tour, candidates=None):
+        n = len(tour)
+        if candidates is None:
+            candidates = nearest_candidates(dist, n - 1)
+        position = tour_positions(tour)
+        k = candidates.shape[1]
+        moves, deltas = [], []
+        for length in range(1, min(self.max_segment, n - 2) + 1):
+            starts = np.arange(n)
+            ends = (starts + length - 1) % n
+            # Segment head goes after a candidate of it, segment tail before one
+            i = np.concatenate((np.repeat(starts, k), np.repeat(starts, k)))
+            g = np.concatenate((position[candidates[tour[starts]].ravel()],
+                                (position[candidates[tour[ends]].ravel()] - 1) % n))
+            offset = (g - i) % n
+            valid = (offset >= length) & (offset != n - 1)
+            i, g = i[valid], g[valid]
+
+            s, e = tour[i], tour[(i + length - 1) % n]
+            p, q = tour[i - 1], tour[(i + length) % n]
+            c, c_next = tour[g], tour[(g + 1) % n]
+            moves.append(np.column_stack((i, np.full_like(i, length), g)))
+            deltas.append(dist[p, q] + dist[c, s] + dist[e, c_next]
+                          - dist[p, s] - dist[e, q] - dist[c, c_next])
+        if not moves:
+            return np.empty((0, 3), dtype=np.int64), np.empty(0)
+        return np.concatenate(moves), np.concatenate(deltas)
+
+    def is_tabu(self, memory, tour, moves):
+        n = len(tour)
+        i, length, g = moves[:, 0], moves[:, 1], moves[:, 2]
+        return (memory.is_tabu(tour[g], tour[i])
+                | memory.is_tabu(tour[(i + length - 1) % n], tour[(g + 1) % n]))
+
+    def mark(self, memory, tour, move):
+        n = len(tour)
+        i, length = move[0], move[1]
+        memory.add(tour[i - 1], tour[i])
+        memory.add(tour[(i + length - 1) % n], tour[(i + length) % n])
+
+    def apply(self, tour, move):
+        i, length, g = move
+        rotated = np.roll(tour, -i)
+        segment, rest = rotated[:length], rotated[length:]
+        after = (g - i) % len(tour) - length
+        return np.concatenate((rest[:after + 1], segment, rest[after + 1:]))
+
+
+NEIGHBORHOODS = {
+    neighborhood.name: neighborhood
+    for neighborhood in (SwapNeighborhood, TwoOptNeighborhood, OrOptNeighborhood)
+}
@@ -0,0 +1,130 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from utils.graph_utils import ensure_csr
+from .tabu import TabuSearch
+
+WorkerStats = namedtuple('WorkerStats', ['worker', 'seed', 'best_cost', 'iterations', 'seconds',
+                                         'stopped_by'])
+MultiStartResult = namedtuple('MultiStartResult', ['best_solution', 'best_cost', 'workers'])
+
+# Graph snapshot of the current worker process, sent once by the pool initializer
+_worker_graph = None
+
+
+def _init_worker(csr):
+    global _worker_graph
+    _worker_graph = csr
+
+
+def _run_trajectory(seed, initial, params, deadline, kick=False):
+    """Run one Tabu Search trajectory in a worker process
+
+    deadline is a time.time() value, so that it holds across processes and
+    for trajectories that waited for a free worker. With kick, the search
+    starts from a double-bridge kick of initial (a migrant tour): from the
+    same tour it would repeat its neighbour's trajectory move for move.
+    """
+    started = time.perf_counter()
+    if deadline is not None:
+        params = dict(params, time_limit=max(deadline - time.time(), 0.0))
+    tabu = TabuSearch(_worker_graph, seed=seed, **params)
+    if kick:
+        csr = tabu.csr
+        initial = csr.names(tabu.perturb(np.array([csr.node_id(node) for node in initial], dtype=np.int64)))
+    result = tabu.solve(initial=initial)
+    best = result.best_solution
+    # Iterations at the end of the round without a better tour than it started from
+    unimproved = tabu.iterations - result.history[-1].iteration
+    return (best, tabu.calculate_cost(best), tabu.iterations, time.perf_counter() - started,
+            tabu.stats.neighbors_evaluated, unimproved, result.stopped_by)
+
+
+def multi_start_search(graph, starts=None, workers=None, seed=0, migrate_every=None, **params):
+    """Run independent Tabu Search trajectories with different seeds in parallel
+
+    Trajectory i is seeded with seed + i. With migrate_every, the trajectories
+    run as islands in rounds of that many iterations; between rounds each island
+    continues from the better of its own best tour and its ring neighbour's
+    (elite migration). An island taking its neighbour's tour starts the next
+    round from a kick of it, drawn from a seed of its own for each round, so
+    the islands do not turn into copies of each other. Other keyword
+    arguments go to TabuSearch.
+
+    The limits hold across rounds: time_limit is in seconds for the whole
+    call, max_iter, max_evaluations and patience are per trajectory. With
+    max_iter None, rounds go on until every trajectory has hit another limit.
+    """
+    csr = ensure_csr(graph)
+    workers = workers or os.cpu_count() or 1
+    starts = starts or workers
+    max_iter = params.pop('max_iter', 50)
+    time_limit = params.pop('time_limit', None)
+    max_evaluations = params.pop('max_evaluations', None)
+    patience = params.pop('patience', None)
+    if max_iter is None and time_limit is None and max_evaluations is None and patience is None:
+        raise ValueError("Tabu Search needs max_iter, time_limit, max_evaluations or patience")
+    deadline = time.time() + time_limit if time_limit is not None else None
+    round_iter = migrate_every or max_iter
+
+    seeds = [seed + i if seed is not None else None for i in range(starts)]
+    tours = [None] * starts
+    costs = [float('inf')] * starts
+    iterations = [0] * starts
+    seconds = [0.0] * starts
+    evaluated = [0] * starts
+    unimproved = [0] * starts
+    stopped_by = [None] * starts
+    # Islands that took their neighbour's tour in the last migration
+    migrated = [False] * starts
+
+    with ProcessPoolExecutor(max_workers=min(workers, starts), initializer=_init_worker,
+                             initargs=(csr,)) as pool:
+        round_index = 0
+        while True:
+            # Trajectories that have not hit a limit yet, with what is left of their budgets
+            futures = {}
+            for i in range(starts):
+                if stopped_by[i] is not None:
+                    continue
+                limits = {'max_iter': round_iter}
+                if max_iter is not None:
+                    limits['max_iter'] = min(round_iter, max_iter - iterations[i])
+                if max_evaluations is not None:
+                    limits['max_evaluations'] = max_evaluations - evaluated[i]
+                if patience is not None:
+                    limits['patience'] = patience - unimproved[i]
+                # A new seed per round, so kicks and constructions differ between rounds
+                round_seed = seeds[i] + round_index * starts if seeds[i] is not None else None
+                futures[i] = pool.submit(_run_trajectory, round_seed, tours[i], dict(params, **limits),
+                                         deadline, migrated[i])
+            if not futures:
+                break
+
+            for i, future in futures.items():
+                tour, cost, done, elapsed, scored, stuck, stopped = future.result()
+                # Only a tour better than the island's best resets its patience
+                unimproved[i] = stuck if cost < costs[i] else unimproved[i] + done
+                if cost < costs[i]:
+                    tours[i], costs[i] = tour, cost
+                iterations[i] += done
+                seconds[i] += elapsed
+                evaluated[i] += scored
+                if stopped != 'iterations' or iterations[i] == max_iter:
+                    stopped_by[i] = stopped
+
+            if migrate_every and starts > 1:
+                # Ring migration of elite tours
+                migrants = [(tours[i - 1], costs[i - 1]) for i in range(starts)]
+                for i, (tour, cost) in enumerate(migrants):
+                    migrated[i] = cost < costs[i]
+                    if migrated[i]:
+                        tours[i], costs[i] = tour, cost
+            round_index += 1
+
+    best = min(range(starts), key=costs.__getitem__)
+    stats = [WorkerStats(i, seeds[i], costs[i], iterations[i], seconds[i], stopped_by[i])
+             for i in range(starts)]
+    return MultiStartResult(tours[best], costs[best], stats)
@@ -1,82 +1,247 @@
 import random
 import time
+from collections import namedtuple
 import numpy as np
-from .visualizer import TabuVisualizer
+from utils.graph_utils import ensure_csr
+from ..events import EventSource, TabuStep
+from ..trace import TabuTraceWriter, recorded
+from .construction import (CONSTRUCTIONS, greedy_edge_tour, nearest_neighbor_tour,
+                           space_filling_curve_tour)
+from .memory import TabuMemory
+from .neighborhoods import NEIGHBORHOODS, nearest_candidates, tour_cost
 
+# A new best tour: after how many iterations and seconds, and its cost
+ConvergencePoint = namedtuple('ConvergencePoint', ['iteration', 'seconds', 'best_cost'])
+TabuResult = namedtuple('TabuResult', ['best_solution', 'best_cost', 'history', 'stopped_by'])
 
-class TabuSearch:
-    def __init__(self, graph, canvas, max_iter=50, tabu_size=10):
-        self.visualizer = TabuVisualizer(graph, canvas)
+
+class TabuSearch(EventSource):
+    """Tabu Search for the closed tour through all nodes
+
+    neighborhood is 'swap', '2-opt' or 'or-opt'. Moves are only tried towards
+    each city's `candidates` nearest cities (None tries every city).
+
+    construction picks the initial tour: 'random', 'nearest-neighbor' (from a
+    random city), 'greedy' (cheapest edges first) or 'space-filling-curve'
+    (Hilbert order of pos, falling back to the visualizer layout). Its cost
+    and the time it took are left in the stats.
+
+    The run stops after max_iter iterations (None for no limit), once
+    time_limit seconds have passed since it started, once max_evaluations
+    neighbors were scored, or after patience iterations without a better
+    tour, whichever comes first. The limits are checked between iterations,
+    so a run overshoots time_limit by at most one iteration. With
+    restart_after, a search stuck that many iterations without a better tour
+    restarts from a perturbed copy of the best tour with empty tabu memory.
+    The best cost after every improvement is kept in `history` and the
+    reason the run stopped in `stopped_by`.
+    """
+
+    def __init__(self, graph, canvas=None, max_iter=50, tabu_size=10,
+                 neighborhood='swap', candidates=10, seed=None, time_limit=None,
+                 max_evaluations=None, patience=None, restart_after=None,
+                 construction='random', pos=None):
+        super().__init__()
+        if construction not in CONSTRUCTIONS:
+            raise ValueError(f"Unknown construction {construction!r}")
+        if max_iter is None and time_limit is None and max_evaluations is None and patience is None:
+            raise ValueError("Tabu Search needs max_iter, time_limit, max_evaluations or patience")
+        # Without a seed keep drawing from the global random module
+        self.rng = random.Random(seed) if seed is not None else random
+        self.iterations = 0
+        self.history = []
+        # Best tour of the last run, also after it was stopped early
+        self.best_solution = None
+        self.stopped_by = None
+        self.csr = ensure_csr(graph)
         self.graph = graph
         self.max_iter = max_iter
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.patience = patience
+        self.restart_after = restart_after
         self.tabu_size = tabu_size
+        self.neighborhood = NEIGHBORHOODS[neighborhood]()
+        self.candidates = candidates
+        self.construction = construction
+        self.visualizer = None
+        if canvas is not None:
+            from .visualizer import TabuVisualizer
+            self.visualizer = TabuVisualizer(graph, canvas, self.stats)
+            self.subscribe(self.visualizer.on_step)
+        self.pos = pos
+        if construction == 'space-filling-curve' and pos is None:
+            if self.visualizer is None:
+                raise ValueError("Space-filling curve construction needs node positions")
+            self.pos = self.visualizer.pos
 
     def initial_solution(self):
         """Generate random path visiting all nodes"""
-        nodes = list(self.graph.nodes())
-        random.shuffle(nodes)
+        nodes = list(self.csr.nodes)
+        self.rng.shuffle(nodes)
         return nodes
 
+    def construct(self, dist, candidates):
+        """Initial tour (an array of node IDs) built by the chosen construction"""
+        if self.construction == 'nearest-neighbor':
+            return nearest_neighbor_tour(dist, candidates, self.rng.randrange(len(dist)))
+        if self.construction == 'greedy':
+            if candidates is None:
+                candidates = nearest_candidates(dist, 10)
+            return greedy_edge_tour(dist, candidates)
+        if self.construction == 'space-filling-curve':
+            return space_filling_curve_tour([self.pos[node] for node in self.csr.nodes])
+        return np.array([self.csr.node_id(node) for node in self.initial_solution()], dtype=np.int64)
+
+    def perturb(self, tour):
+        """Double-bridge kick: cut the tour in four parts and swap the middle two"""
+        if len(tour) < 4:
+            return tour.copy()
+        a, b, c = sorted(self.rng.sample(range(1, len(tour)), 3))
+        return np.concatenate((tour[:a], tour[b:c], tour[a:b], tour[c:]))
+
+    def distance_matrix(self):
+        """Dense weight matrix of the graph; missing edges cost 1"""
+        return self.csr.to_dense(missing=1.0)
+
     def calculate_cost(self, path):
         """Calculate total path cost"""
+        csr = self.csr
+        ids = [csr.node_id(node) for node in path]
         total = 0
-        for i in range(len(path) - 1):
-            edge_data = self.graph.get_edge_data(path[i], path[i + 1])
-            total += edge_data['weight'] if edge_data else 1
+        for i in range(len(ids) - 1):
+            total += csr.edge_weight(ids[i], ids[i + 1], 1)
         # Return to start for TSP
-        edge_data = self.graph.get_edge_data(path[-1], path[0])
-        total += edge_data['weight'] if edge_data else 1
+        total += csr.edge_weight(ids[-1], ids[0], 1)
         return total
 
-    def get_neighbors(self, solution):
-        """Generate neighbors by swapping two cities"""
-        neighbors = []
-        for i in range(len(solution)):
-            for j in range(i + 1, len(solution)):
-                neighbor = solution.copy()
-                neighbor[i], neighbor[j] = neighbor[j], neighbor[i]
-                neighbors.append(neighbor)
-        return neighbors
-
-    def search(self, delay=0.5):
-        current = self.initial_solution()
-        best = current.copy()
-        tabu_list = []
-
-        for iteration in range(self.max_iter):
-            neighbors = self.get_neighbors(current)
-            best_neighbor = None
-            best_neighbor_cost = float('inf')
-
-            for neighbor in neighbors:
-                if neighbor not in tabu_list:
-                    cost = self.calculate_cost(neighbor)
-                    if cost < best_neighbor_cost:
-                        best_neighbor = neighbor
-                        best_neighbor_cost = cost
-
-            if not best_neighbor:
-                break
-
-            current = best_neighbor
-            tabu_list.append(current)
-
-            if len(tabu_list) > self.tabu_size:
-                tabu_list.pop(0)
-
-            if self.calculate_cost(current) < self.calculate_cost(best):
-                best = current.copy()
-
-            # Update visualization
-            self.visualizer.update(
-                iteration=iteration,
-                current_solution=current,
-                best_solution=best,
-                tabu_list=tabu_list,
-                current_cost=self.calculate_cost(current),
-                best_cost=self.calculate_cost(best)
-            )
-
-            time.sleep(delay)
-
-        return best
\ No newline at end of file
+    def search(self, delay=0.5, initial=None, trace=None):
+        """Run to completion; only sleeps between iterations when visualized"""
+        steps = self.steps(events=bool(self.listeners), initial=initial, trace=trace)
+        return self.run_steps(steps, delay if self.visualizer else 0)
+
+    def solve(self, initial=None):
+        """Run without events and return a TabuResult
+
+        That is the best tour, its cost, the convergence history as
+        ConvergencePoints and the limit that stopped the run ('iterations',
+        'time', 'evaluations', 'patience' or 'no moves').
+        """
+        best = self.run_steps(self.steps(events=False, initial=initial), 0)
+        return TabuResult(best, self.history[-1].best_cost, self.history, self.stopped_by)
+
+    def steps(self, events=True, initial=None, trace=None):
+        """Yield a TabuStep per iteration and return the best solution
+
+        initial is a starting tour of node names (built by the construction by
+        default). trace is
+        a file path to record the run to (see search_algorithms.trace). The
+        run's counters are left in self.stats.
+        """
+        self.stats.reset()
+        if trace is not None and self.restart_after is not None:
+            raise ValueError("Traces of restarted runs are not supported")
+        if trace is None:
+            return self._steps(events, initial)
+        writer = TabuTraceWriter(trace, self.csr.nodes, self.neighborhood.name, self.tabu_size,
+                                 algorithm=type(self).__name__, max_iter=self.max_iter,
+                                 candidates=self.candidates)
+        return recorded(self._steps(events, initial, writer), writer)
+
+    def _steps(self, events, initial, writer=None):
+        clock = time.perf_counter
+        started = clock()
+        deadline = started + self.time_limit if self.time_limit is not None else None
+        csr = self.csr
+        dist = self.distance_matrix()
+        neighborhood = self.neighborhood
+        candidates = None
+        if self.candidates is not None:
+            candidates = nearest_candidates(dist, self.candidates)
+
+        if initial is None:
+            with self.stats.timer('construction'):
+                current = self.construct(dist, candidates)
+        else:
+            current = np.array([csr.node_id(node) for node in initial], dtype=np.int64)
+        current_cost = self.stats.initial_cost = tour_cost(dist, current)
+        best, best_cost = current.copy(), current_cost
+        memory = TabuMemory(len(csr), self.tabu_size)
+        self.iterations = 0
+        history = self.history = [ConvergencePoint(0, clock() - started, best_cost)]
+        if writer is not None:
+            writer.start(current_cost)
+
+        evaluated = restarts = 0
+        # Iterations since the best tour last improved, and since then or the last restart
+        unimproved = stagnant = 0
+        iteration = 0
+        try:
+            while True:
+                if self.max_iter is not None and iteration >= self.max_iter:
+                    self.stopped_by = 'iterations'
+                    break
+                if deadline is not None and clock() >= deadline:
+                    self.stopped_by = 'time'
+                    break
+                if self.max_evaluations is not None and evaluated >= self.max_evaluations:
+                    self.stopped_by = 'evaluations'
+                    break
+                if self.patience is not None and unimproved >= self.patience:
+                    self.stopped_by = 'patience'
+                    break
+                self.iterations = iteration + 1
+                # Score the whole neighborhood at once. Tabu moves are skipped
+                # unless they beat the best tour (aspiration).
+                moves, deltas = neighborhood.evaluate(dist, current, candidates)
+                evaluated += len(moves)
+                if not len(moves):
+                    self.stopped_by = 'no moves'
+                    break
+                allowed = (~neighborhood.is_tabu(memory, current, moves)
+                           | (current_cost + deltas < best_cost))
+                if not allowed.any():
+                    self.stopped_by = 'no moves'
+                    break
+
+                move = moves[int(np.argmin(np.where(allowed, deltas, np.inf)))]
+                neighborhood.mark(memory, current, move)
+                previous, previous_best = current, best
+                current = neighborhood.apply(current, move)
+                current_cost = tour_cost(dist, current)
+                memory.advance()
+
+                if current_cost < best_cost:
+                    best, best_cost = current.copy(), current_cost
+                    history.append(ConvergencePoint(iteration + 1, clock() - started, best_cost))
+                    unimproved = stagnant = 0
+                else:
+                    unimproved += 1
+                    stagnant += 1
+                if writer is not None:
+                    writer.record(move, current_cost, best_cost, previous, previous_best)
+
+                if events:
+                    yield TabuStep(
+                        iteration=iteration,
+                        current_solution=csr.names(current),
+                        best_solution=csr.names(best),
+                        tabu_moves=[(csr.node_name(a), csr.node_name(b)) for a, b in memory.active()],
+                        current_cost=current_cost,
+                        best_cost=best_cost
+                    )
+
+                if self.restart_after is not None and stagnant >= self.restart_after:
+                    # Diversify: continue from a kicked copy of the best tour
+                    current = self.perturb(best)
+                    current_cost = tour_cost(dist, current)
+                    memory = TabuMemory(len(csr), self.tabu_size)
+                    stagnant = 0
+                    restarts += 1
+                iteration += 1
+        finally:
+            self.stats.iterations, self.stats.neighbors_evaluated = self.iterations, evaluated
+            self.stats.restarts = restarts
+            self.best_solution = csr.names(best)
+
+        return self.best_solution
@@ -1,55 +1,105 @@
-import tkinter as tk  # Added this import
-import matplotlib.pyplot as plt
-import networkx as nx
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection
+from utils.graph_drawing import GraphDrawing
+from utils.layout import shared_layout
+from utils.render_surface import acquire_surface
+from ..stats import SearchStats
 
 
 class TabuVisualizer:
-    def __init__(self, graph, canvas):
+    def __init__(self, graph, canvas, stats=None):
         self.graph = graph
         self.canvas = canvas
-        self.fig, self.ax = plt.subplots(figsize=(8, 6))
-        self.pos = nx.spring_layout(graph)
+        # Layout and drawing time go to the stats of the search being shown
+        self.stats = stats or SearchStats()
+        with self.stats.timer('layout'):
+            self.pos = shared_layout(graph, canvas)
 
-        # Embed in Tkinter
-        self.canvas_widget = FigureCanvasTkAgg(self.fig, master=self.canvas)
-        self.canvas_widget.draw()
-        self.canvas_widget.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        # Draw on the canvas' reusable render surface
+        self.surface = acquire_surface(canvas)
+        self.fig, self.ax, self.canvas_widget = self.surface.fig, self.surface.ax, self.surface.canvas
+        with self.stats.timer('render'):
+            self.setup_artists()
+            self.surface.connect('draw_event', self.on_draw)
+            self.canvas_widget.draw()
 
-    def update(self, iteration, current_solution, best_solution, tabu_list, current_cost, best_cost):
+    def setup_artists(self):
+        """Draw the static graph once and create the per-iteration overlay artists"""
         self.ax.clear()
 
-        # Draw the complete graph
-        nx.draw_networkx_nodes(self.graph, self.pos, ax=self.ax, node_size=400, node_color='lightblue')
-        nx.draw_networkx_edges(self.graph, self.pos, ax=self.ax, width=1, alpha=0.3)
+        # Draw the complete graph at the level of detail of the view; nodes and
+        # names are animated, as tours run under them
+        self.drawing = GraphDrawing(self.ax, self.graph, self.pos, node_size=400, edge_alpha=0.3,
+                                    animated=True, label_limit=getattr(self.canvas, 'label_limit', 150),
+                                    density_limit=getattr(self.canvas, 'density_limit', 50000))
+        self.ax.set_title("Tabu Search - Traveling Salesman Problem", fontsize=12)
+
+        self.tabu_layer = LineCollection([], colors='gray', linewidths=1, alpha=0.4,
+                                         linestyles='dashed', animated=True)
+        self.current_layer = LineCollection([], colors='red', linewidths=2, alpha=0.7, animated=True)
+        self.best_layer = LineCollection([], colors='green', linewidths=3, alpha=0.9, animated=True)
+        for layer in (self.tabu_layer, self.current_layer, self.best_layer):
+            self.ax.add_collection(layer, autolim=False)
+        self.info = self.ax.text(0.02, 0.98, "", transform=self.ax.transAxes, animated=True,
+                                 verticalalignment='top', bbox=dict(facecolor='white', alpha=0.7))
+        self.background = None
+        self.best_solution = None
+        self.pending = None
+
+    def tour_segments(self, solution):
+        return [(self.pos[u], self.pos[v]) for u, v in zip(solution, solution[1:] + solution[:1])]
+
+    def on_step(self, event):
+        """Record a TabuStep event; it is drawn by the next render()"""
+        self.pending = event
+
+    def render(self):
+        """Draw the latest recorded iteration, if any (called once per animation frame)"""
+        if self.pending is not None:
+            event, self.pending = self.pending, None
+            with self.stats.timer('render'):
+                self.update(*event)
+
+    def seek(self, trace, iteration):
+        """Show the state of a recorded run at the given iteration (replay mode)"""
+        self.pending = trace.event(iteration)
+        self.render()
 
+    def refresh(self):
+        """Render and let Tk process pending events (blocking runs)"""
+        self.render()
+        with self.stats.timer('render'):
+            self.canvas.update()
+
+    def on_draw(self, event):
+        """Cache the background after a full redraw and put the overlay back"""
+        self.background = self.canvas_widget.copy_from_bbox(self.ax.bbox)
+        self.draw_overlay()
+        self.canvas_widget.blit(self.ax.bbox)
+
+    def update(self, iteration, current_solution, best_solution, tabu_moves, current_cost, best_cost):
         # Highlight current solution (red)
-        current_edges = list(zip(current_solution, current_solution[1:] + [current_solution[0]]))
-        nx.draw_networkx_edges(self.graph, self.pos, edgelist=current_edges,
-                               ax=self.ax, width=2, edge_color='red', alpha=0.7)
-
-        # Highlight best solution (green)
-        best_edges = list(zip(best_solution, best_solution[1:] + [best_solution[0]]))
-        nx.draw_networkx_edges(self.graph, self.pos, edgelist=best_edges,
-                               ax=self.ax, width=3, edge_color='green', alpha=0.9)
-
-        # Draw tabu solutions (gray)
-        for solution in tabu_list:
-            edges = list(zip(solution, solution[1:] + [solution[0]]))
-            nx.draw_networkx_edges(self.graph, self.pos, edgelist=edges,
-                                   ax=self.ax, width=1, edge_color='gray', alpha=0.2)
-
-        # Draw labels
-        nx.draw_networkx_labels(self.graph, self.pos, ax=self.ax)
-        edge_weights = nx.get_edge_attributes(self.graph, 'weight')
-        if edge_weights:
-            nx.draw_networkx_edge_labels(self.graph, self.pos, edge_labels=edge_weights, ax=self.ax)
+        self.current_layer.set_segments(self.tour_segments(current_solution))
+
+        # Highlight best solution (green), rebuilt only when it changes
+        if best_solution != self.best_solution:
+            self.best_solution = list(best_solution)
+            self.best_layer.set_segments(self.tour_segments(best_solution))
+
+        # Draw tabu moves as the swapped city pairs (gray, dashed)
+        self.tabu_layer.set_segments([(self.pos[u], self.pos[v]) for u, v in tabu_moves])
 
         # Add info text
-        info_text = f"Iteration: {iteration}\nCurrent Cost: {current_cost:.2f}\nBest Cost: {best_cost:.2f}"
-        self.ax.text(0.02, 0.98, info_text, transform=self.ax.transAxes,
-                     verticalalignment='top', bbox=dict(facecolor='white', alpha=0.7))
+        self.info.set_text(f"Iteration: {iteration}\nCurrent Cost: {current_cost:.2f}\nBest Cost: {best_cost:.2f}")
 
-        self.ax.set_title("Tabu Search - Traveling Salesman Problem", fontsize=12)
-        self.canvas_widget.draw()
-        self.canvas.update()
\ No newline at end of file
+        if self.background is None:
+            self.canvas_widget.draw()
+        else:
+            self.canvas_widget.restore_region(self.background)
+            self.draw_overlay()
+            self.canvas_widget.blit(self.ax.bbox)
+
+    def draw_overlay(self):
+        for artist in (self.tabu_layer, self.current_layer, self.best_layer):
+            self.ax.draw_artist(artist)
+        self.drawing.draw_animated()
+        self.ax.draw_artist(self.info)
@@ -0,0 +1,338 @@
+import json
+import os
+import numpy as np
+from utils.graph_utils import node_from_json
+from .events import EventSource, SearchStep, TabuStep
+from .tabu_search.memory import TabuMemory
+from .tabu_search.neighborhoods import NEIGHBORHOODS
+
+# A trace is three files: the append-only record log at `path`, an index at
+# `path.index` and the metadata (node names, parameters, result) at
+# `path.json`. Both binary files are memory mapped when loaded.
+
+# One DFS/UCS expansion: popped node, node it was reached from, frontier size
+# and path cost (20 bytes). The index holds the step of each node's first
+# expansion, which is all that is needed to rebuild any step: the nodes
+# visited before a step are a prefix of it, found by binary search.
+SEARCH_RECORD = np.dtype([('node', '<i4'), ('parent', '<i4'), ('frontier', '<i4'), ('cost', '<f8')])
+
+# One Tabu iteration: the applied move and the costs after it (28 bytes). The
+# index holds keyframes of (iteration, current tour, best tour) taken before
+# every `interval`-th move.
+TABU_RECORD = np.dtype([('move', '<i4', (3,)), ('current_cost', '<f8'), ('best_cost', '<f8')])
+
+
+class TraceWriter:
+    """Append records to a trace file, buffering them into large writes"""
+
+    dtype = None
+
+    def __init__(self, path, nodes, buffer_size=65536, **meta):
+        self.path = path
+        self.meta = dict(meta, kind=self.kind, nodes=list(nodes))
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.count = 0
+        self.records = open(path, 'wb')
+        self.index = open(path + '.index', 'wb')
+        # Written up front too, so an interrupted run can still be replayed
+        self.write_meta()
+
+    def write_meta(self):
+        with open(self.path + '.json', 'w') as f:
+            json.dump(self.meta, f)
+
+    def append(self, record):
+        self.buffer.append(record)
+        self.count += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            np.array(self.buffer, dtype=self.dtype).tofile(self.records)
+            self.buffer = []
+
+    def close(self, result=None):
+        """Flush the remaining records and store the run's result"""
+        if self.records.closed:
+            return
+        self.flush()
+        self.records.close()
+        self.index.close()
+        self.meta['steps'] = self.count
+        self.meta['result'] = result
+        self.write_meta()
+
+
+class SearchTraceWriter(TraceWriter):
+    kind = 'search'
+    dtype = SEARCH_RECORD
+
+    def __init__(self, path, nodes, **meta):
+        super().__init__(path, nodes, **meta)
+        self.seen = bytearray(len(self.meta['nodes']))
+        self.first_steps = []
+
+    def record(self, node, parent, frontier_size, cost):
+        if not self.seen[node]:
+            self.seen[node] = 1
+            self.first_steps.append(self.count)
+        self.append((node, parent, frontier_size, cost))
+
+    def flush(self):
+        super().flush()
+        if self.first_steps:
+            np.array(self.first_steps, dtype='<i8').tofile(self.index)
+            self.first_steps = []
+
+
+class TabuTraceWriter(TraceWriter):
+    kind = 'tabu'
+    dtype = TABU_RECORD
+
+    def __init__(self, path, nodes, neighborhood, tenure, interval=256, **meta):
+        super().__init__(path, nodes, neighborhood=neighborhood, tenure=tenure,
+                         interval=interval, **meta)
+        self.interval = interval
+
+    def start(self, cost):
+        """Store the cost of the initial tour (the first keyframe holds the tour)"""
+        self.meta['initial_cost'] = cost
+        self.write_meta()
+
+    def record(self, move, current_cost, best_cost, tour, best):
+        """Record an iteration; tour and best are the tours before the move"""
+        if self.count % self.interval == 0:
+            np.concatenate(([self.count], tour, best)).astype('<i4').tofile(self.index)
+        self.append((tuple(move), current_cost, best_cost))
+
+
+def recorded(steps, writer):
+    """Drive a step generator, closing writer with its result even if abandoned"""
+    result = None
+    try:
+        result = yield from steps
+    finally:
+        writer.close(result)
+    return result
+
+
+def _map(path, dtype):
+    """Memory map a binary file as an array of dtype (ignoring a torn last record)"""
+    dtype = np.dtype(dtype)
+    count = os.path.getsize(path) // dtype.itemsize
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+
+class SearchTrace:
+    """A recorded DFS/UCS/A* run; any step is rebuilt without re-running the search
+
+    Seeking only reads the trace up to the step sought: parent pointers are
+    filled in blocks of `block` first expansions as far as a seek needs them,
+    and visited() can return just the nodes after those already shown.
+    """
+
+    kind = 'search'
+    block = 4096
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self.nodes = [node_from_json(node) for node in meta['nodes']]
+        self.records = _map(path, SEARCH_RECORD)
+        self.first_steps = _map(path + '.index', '<i8')
+        self._parents = None
+        self._filled = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def result(self):
+        result = self.meta.get('result')
+        return None if result is None else [node_from_json(node) for node in result]
+
+    def visited_count(self, step):
+        """Number of nodes expanded before the given step"""
+        return int(np.searchsorted(self.first_steps, step))
+
+    def parents(self, count=None):
+        """Node each node was first expanded from (the parent pointers of the run)
+
+        Only the pointers of the first count expanded nodes (all by default)
+        are sure to be filled in; the others may still be -1.
+        """
+        if self._parents is None:
+            self._parents = np.full(len(self.nodes), -1, dtype=np.int64)
+        total = self.visited_count(len(self.records))
+        count = total if count is None else min(count, total)
+        if count > self._filled:
+            end = min(-(-count // self.block) * self.block, total)
+            first = self.first_steps[self._filled:end]
+            self._parents[self.records['node'][first]] = self.records['parent'][first]
+            self._filled = end
+        return self._parents
+
+    def visited(self, step, begin=0):
+        """Nodes expanded before the given step, in expansion order, from the begin-th on"""
+        first = self.first_steps[begin:self.visited_count(step)]
+        nodes = self.nodes
+        return [nodes[node] for node in self.records['node'][first].tolist()]
+
+    def reached_from(self, step, begin=0):
+        """Node each of visited(step, begin) was first expanded from (None for the start)"""
+        first = self.first_steps[begin:self.visited_count(step)]
+        nodes = self.nodes
+        return [nodes[node] if node != -1 else None for node in self.records['parent'][first].tolist()]
+
+    def event(self, step):
+        """Rebuild the SearchStep of the given step"""
+        record = self.records[step]
+        node, via = int(record['node']), int(record['parent'])
+        # Every node on the path was first expanded before this step
+        parents = self.parents(self.visited_count(step))
+        path = [node]
+        while via != -1:
+            path.append(via)
+            via = int(parents[via])
+        path.reverse()
+        nodes = self.nodes
+        return SearchStep(step, nodes[node], int(record['frontier']), float(record['cost']),
+                          [nodes[i] for i in path])
+
+    def steps(self, start=0):
+        """Yield the recorded SearchSteps from start on and return the run's result"""
+        for step in range(start, len(self)):
+            yield self.event(step)
+        return self.result
+
+
+class TabuTrace:
+    """A recorded Tabu Search run, replayed from the nearest keyframe when seeking"""
+
+    kind = 'tabu'
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self.nodes = [node_from_json(node) for node in meta['nodes']]
+        self.records = _map(path, TABU_RECORD)
+        width = 2 * len(self.nodes) + 1
+        keys = _map(path + '.index', '<i4')
+        self.keys = keys[:len(keys) // width * width].reshape(-1, width)
+        self.interval = meta['interval']
+        self.tenure = meta['tenure']
+        self.neighborhood = NEIGHBORHOODS[meta['neighborhood']]()
+
+    def __len__(self):
+        # Records past the last keyframe block can't be replayed if the run was torn
+        return min(len(self.records), len(self.keys) * self.interval)
+
+    @property
+    def result(self):
+        result = self.meta.get('result')
+        return None if result is None else [node_from_json(node) for node in result]
+
+    def state(self, iteration):
+        """Current tour, best tour and best cost before the given iteration's move"""
+        key = self.keys[iteration // self.interval]
+        n = len(self.nodes)
+        t = int(key[0])
+        current = np.array(key[1:n + 1], dtype=np.int64)
+        best = np.array(key[n + 1:], dtype=np.int64)
+        best_cost = self.records['best_cost']
+        previous = float(best_cost[t - 1]) if t else self.meta['initial_cost']
+        moves = self.records['move']
+        apply = self.neighborhood.apply
+        for t in range(t, iteration):
+            current = apply(current, moves[t])
+            if best_cost[t] < previous:
+                best = current.copy()
+            previous = float(best_cost[t])
+        return current, best, previous
+
+    def event(self, iteration):
+        """Rebuild the TabuStep of the given iteration"""
+        return next(self.steps(iteration))
+
+    def steps(self, start=0):
+        """Yield the recorded TabuSteps from start on and return the best tour
+
+        Replay starts `tenure` iterations early so the tabu list is complete.
+        """
+        first = max(0, start - self.tenure + 1)
+        if first >= len(self):
+            return self.result
+        current, best, previous = self.state(first)
+        memory = TabuMemory(len(self.nodes), self.tenure)
+        memory.iteration = first
+        neighborhood, nodes = self.neighborhood, self.nodes
+        moves, current_costs, best_costs = (self.records['move'], self.records['current_cost'],
+                                            self.records['best_cost'])
+
+        for iteration in range(first, len(self)):
+            move = moves[iteration]
+            neighborhood.mark(memory, current, move)
+            current = neighborhood.apply(current, move)
+            memory.advance()
+            if best_costs[iteration] < previous:
+                best = current.copy()
+            previous = float(best_costs[iteration])
+
+            if iteration >= start:
+                yield TabuStep(
+                    iteration=iteration,
+                    current_solution=[nodes[i] for i in current.tolist()],
+                    best_solution=[nodes[i] for i in best.tolist()],
+                    tabu_moves=[(nodes[a], nodes[b]) for a, b in memory.active()],
+                    current_cost=float(current_costs[iteration]),
+                    best_cost=previous
+                )
+        return self.result
+
+
+def load_trace(path):
+    """Open a recorded trace (a SearchTrace or TabuTrace) without reading it into memory"""
+    with open(path + '.json') as f:
+        meta = json.load(f)
+    if meta['kind'] == 'tabu':
+        return TabuTrace(path, meta)
+    return SearchTrace(path, meta)
+
+
+class TracePlayer(EventSource):
+    """Replays a recorded trace through the search visualizers"""
+
+    def __init__(self, trace, graph, canvas=None):
+        super().__init__()
+        self.trace = trace
+        missing = [node for node in trace.nodes if node not in graph]
+        if missing:
+            raise ValueError(f"Trace does not match the graph (missing nodes: {missing[:5]})")
+        self.visualizer = None
+        if canvas is not None:
+            if trace.kind == 'tabu':
+                from .tabu_search.visualizer import TabuVisualizer as Visualizer
+            else:
+                from .uninformed.visualizer import SearchVisualizer as Visualizer
+            self.visualizer = Visualizer(graph, canvas, self.stats)
+            self.subscribe(self.visualizer.on_step)
+
+    def search(self, delay=0.5, start=0):
+        """Replay to the end and return the recorded result"""
+        return self.run_steps(self.steps(start), delay if self.visualizer else 0)
+
+    def seek(self, step):
+        """Show the recorded state at the given step"""
+        if self.visualizer is not None:
+            self.visualizer.seek(self.trace, step)
+
+    def steps(self, start=0):
+        """Show the step before start and return a generator of the events from start on"""
+        self.stats.reset()
+        if start:
+            self.seek(start - 1)
+        return self.trace.steps(start)
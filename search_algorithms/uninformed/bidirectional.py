@@ -0,0 +1,88 @@
+from ..events import SearchStep
+from .frontier import INF, PriorityFrontier
+from .ucs import UCS
+
+
+class BidirectionalUCS(UCS):
+    """Uniform-cost search from start and, over reversed edges, from goal at once
+
+    Each step expands the side whose frontier is cheaper. Whenever an edge
+    reaches a node the other side has reached too, the cost through that
+    node is a candidate for the best path. The search stops once the two
+    frontier minimums add up to at least the best candidate, as no path
+    through an unexpanded node can then be cheaper. The result has the same
+    (optimal) cost as UCS; among equally cheap paths it may pick another.
+
+    Steps of the backward search report the path from the node to the goal.
+    Implicit graphs are not supported, as the backward search needs reversed
+    edges.
+    """
+
+    def __init__(self, graph, canvas=None, cache=None, max_cost=None):
+        super().__init__(graph, canvas, cache, max_cost)
+        if self.csr is None:
+            raise ValueError("Bidirectional search needs an explicit graph")
+        # Built once, as reversing the snapshot costs more than most queries
+        self.reverse = self.csr.reverse()
+
+    def steps(self, start, goal, events=True, trace=None):
+        """Yield a SearchStep per popped node (of either side) and return the path (or None)"""
+        if trace is not None:
+            raise ValueError("Traces of bidirectional search are not supported")
+        self.stats.reset()
+        return self._steps(start, goal, events)
+
+    def _steps(self, start, goal, events, writer=None):
+        csr = self.csr
+        reverse = self.reverse
+        start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+        forward, backward = PriorityFrontier(len(csr)), PriorityFrontier(len(csr))
+        forward.push(start_id, 0)
+        backward.push(goal_id, 0)
+        sides = ((forward, backward, csr), (backward, forward, reverse))
+        best, meet = (0, start_id) if start_id == goal_id else (INF, -1)
+        limit = INF if self.max_cost is None else self.max_cost
+        step = peak = 0
+
+        try:
+            while forward.heap and backward.heap:
+                if len(forward) + len(backward) > peak:
+                    peak = len(forward) + len(backward)
+                # Heap tops may be stale entries, but they never overestimate
+                top_forward, top_backward = forward.heap[0][0], backward.heap[0][0]
+                if top_forward + top_backward >= best or top_forward + top_backward > limit:
+                    break
+                frontier, other, graph = sides[top_backward < top_forward]
+
+                node = frontier.pop()
+                if node == -1:
+                    break
+                cost = frontier.cost[node]
+                if events:
+                    path = frontier.path_to(node)
+                    if frontier is backward:
+                        path.reverse()
+                    yield SearchStep(step, csr.node_name(node), len(forward) + len(backward), cost,
+                                     csr.names(path))
+                step += 1
+
+                push, this_cost, other_cost = frontier.push, frontier.cost, other.cost
+                offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+                for k in range(offsets[node], offsets[node + 1]):
+                    neighbor = targets[k]
+                    push(neighbor, cost + weights[k], node)
+                    if other_cost[neighbor] < INF:
+                        through = this_cost[neighbor] + other_cost[neighbor]
+                        if through < best:
+                            best, meet = through, neighbor
+
+            if meet == -1 or best > limit:
+                return None  # No path found (within max_cost)
+            path = forward.path_to(meet)
+            path.extend(reversed(backward.path_to(meet)[:-1]))
+            return csr.names(path)
+        finally:
+            stats = self.stats
+            stats.expansions, stats.peak_frontier = step, peak
+            stats.pushes = forward.pushes + backward.pushes
+            stats.stale_pops = forward.stale_pops + backward.stale_pops
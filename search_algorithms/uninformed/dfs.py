@@ -1,36 +1,171 @@
-import time
-from .visualizer import SearchVisualizer
+from array import array
+from utils.graph_utils import ensure_csr
+from utils.implicit_graph import ImplicitGraph
+from ..events import EventSource, SearchStep
+from ..trace import SearchTraceWriter, recorded
+from .frontier import reconstruct_path
 
 
-class DFS:
-    def __init__(self, graph, canvas):
-        self.visualizer = SearchVisualizer(graph, canvas)
+class DFS(EventSource):
+    """Depth-first search
+
+    graph may be an ImplicitGraph, searched through its successor function.
+    With max_depth, nodes that deep are not expanded; as nodes are expanded
+    once, a goal first reached by a path too deep can then be missed.
+    """
+
+    def __init__(self, graph, canvas=None, max_depth=None):
+        super().__init__()
+        self.csr = None if isinstance(graph, ImplicitGraph) else ensure_csr(graph)
         self.graph = graph
+        self.max_depth = max_depth
+        self.visualizer = None
+        if canvas is not None:
+            if self.csr is None:
+                raise ValueError("Implicit graphs can't be drawn")
+            from .visualizer import SearchVisualizer
+            self.visualizer = SearchVisualizer(graph, canvas, self.stats)
+            self.subscribe(self.visualizer.on_step)
+
+    def search(self, start, goal, delay=0.5, trace=None):
+        """Run to completion; only sleeps between steps when visualized"""
+        steps = self.steps(start, goal, events=bool(self.listeners), trace=trace)
+        return self.run_steps(steps, delay if self.visualizer else 0)
+
+    def steps(self, start, goal, events=True, trace=None):
+        """Yield a SearchStep per popped node and return the path (or None)
+
+        With events=False nothing is yielded and the search runs at full speed.
+        trace is a file path to record the run to (see search_algorithms.trace).
+        The run's counters are left in self.stats; a stale pop is a node that
+        was already expanded when popped.
+        """
+        self.stats.reset()
+        if self.csr is None:
+            if trace is not None:
+                raise ValueError("Traces need an explicit graph")
+            return self._implicit_steps(start, goal, events)
+        if trace is None:
+            return self._steps(start, goal, events)
+        writer = SearchTraceWriter(trace, self.csr.nodes, algorithm=type(self).__name__,
+                                   start=start, goal=goal)
+        return recorded(self._steps(start, goal, events, writer), writer)
+
+    def _steps(self, start, goal, events, writer=None):
+        csr = self.csr
+        offsets, targets = csr.offsets, csr.targets
+        goal_id = csr.node_id(goal)
+        start_id = csr.node_id(start)
+        # The stack holds (node, node it was pushed from) pairs; paths are
+        # rebuilt from the parent pointers of expanded nodes only when needed
+        stack_nodes = array('q', [start_id])
+        stack_parents = array('q', [-1])
+        parent = array('q', [-1]) * len(csr)
+        visited = bytearray(len(csr))
+        max_depth = self.max_depth
+        depth = array('q', [0]) * len(csr) if writer is not None or max_depth is not None else None
+        step = pushes = stale = 0
+        peak = 1
+
+        try:
+            while stack_nodes:
+                node = stack_nodes.pop()
+                via = stack_parents.pop()
+
+                if events:
+                    path = reconstruct_path(parent, via) + [node] if via != -1 else [node]
+                    yield SearchStep(step, csr.node_name(node), len(stack_nodes), len(path) - 1,
+                                     csr.names(path))
+                if writer is not None:
+                    writer.record(node, via, len(stack_nodes), depth[via] + 1 if via != -1 else 0)
+                step += 1
+
+                if node == goal_id:
+                    parent[node] = via
+                    return csr.names(reconstruct_path(parent, node))
+
+                if not visited[node]:
+                    visited[node] = 1
+                    parent[node] = via
+                    if depth is not None and via != -1:
+                        depth[node] = depth[via] + 1
+                    if max_depth is not None and depth[node] >= max_depth:
+                        continue
+                    size = len(stack_nodes)
+                    # Reverse neighbors for left-to-right exploration in visualization
+                    for k in range(offsets[node + 1] - 1, offsets[node] - 1, -1):
+                        neighbor = targets[k]
+                        if not visited[neighbor]:
+                            stack_nodes.append(neighbor)
+                            stack_parents.append(node)
+                    pushes += len(stack_nodes) - size
+                    if len(stack_nodes) > peak:
+                        peak = len(stack_nodes)
+                else:
+                    stale += 1
+
+            return None  # No path found
+        finally:
+            # Also reached when an animated run is cancelled part way
+            stats = self.stats
+            stats.expansions, stats.peak_frontier = step, peak
+            stats.pushes, stats.stale_pops = pushes + 1, stale  # The start node was pushed too
 
-    def search(self, start, goal, delay=0.5):
-        stack = [(start, [start])]
-        visited = set()
+    def _implicit_steps(self, start, goal, events):
+        space = self.graph
+        successors, decode = space.successors, space.decode
+        goal_code = space.encode(goal)
+        max_depth = self.max_depth
+        # Only expanded states are stored: code -> ID, with the ID's code,
+        # parent ID and depth in parallel tables
+        expanded = {}
+        codes = []
+        parent = array('q')
+        depth = array('q')
+        stack_codes = [space.encode(start)]
+        stack_parents = array('q', [-1])
+        step = pushes = stale = 0
+        peak = 1
 
-        while stack:
-            node, path = stack.pop()
+        def path(via, code):
+            return [decode(codes[i]) for i in reconstruct_path(parent, via)] + [decode(code)] \
+                if via != -1 else [decode(code)]
 
-            # Update visualization
-            self.visualizer.current_node = node
-            self.visualizer.visited_nodes = list(visited)
-            self.visualizer.current_path = path
-            self.visualizer.update_display()
+        try:
+            while stack_codes:
+                code = stack_codes.pop()
+                via = stack_parents.pop()
 
-            if node == goal:
-                return path
+                if events:
+                    current = path(via, code)
+                    yield SearchStep(step, current[-1], len(stack_codes), len(current) - 1, current)
+                step += 1
 
-            if node not in visited:
-                visited.add(node)
-                # Reverse neighbors for left-to-right exploration in visualization
-                neighbors = sorted(self.graph.neighbors(node), reverse=True)
-                for neighbor in neighbors:
-                    if neighbor not in visited:
-                        stack.append((neighbor, path + [neighbor]))
+                if code == goal_code:
+                    return path(via, code)
 
-            time.sleep(delay)  # Pause to see the progress
+                if code in expanded:
+                    stale += 1
+                    continue
+                node = expanded[code] = len(codes)
+                codes.append(code)
+                parent.append(via)
+                depth.append(depth[via] + 1 if via != -1 else 0)
+                if max_depth is not None and depth[node] >= max_depth:
+                    continue
+                size = len(stack_codes)
+                # Reversed, so the first successor is explored first
+                for successor, _ in reversed(list(successors(code))):
+                    if successor not in expanded:
+                        stack_codes.append(successor)
+                        stack_parents.append(node)
+                pushes += len(stack_codes) - size
+                if len(stack_codes) > peak:
+                    peak = len(stack_codes)
 
-        return None  # No path found
\ No newline at end of file
+            return None  # No path found
+        finally:
+            stats = self.stats
+            stats.expansions, stats.peak_frontier = step, peak
+            stats.pushes, stats.stale_pops = pushes + 1, stale
+            stats.states = len(expanded)
@@ -0,0 +1,75 @@
+import heapq
+from array import array
+
+INF = float('inf')
+
+
+def reconstruct_path(parent, node):
+    """Follow parent pointers from node back to the root (-1) and return the path"""
+    path = [node]
+    node = parent[node]
+    while node != -1:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+
+class PriorityFrontier:
+    """Min-heap frontier over node IDs with a best-known-cost table and parent pointers
+
+    A node is only pushed when its new cost beats the best known one, so the
+    heap never holds dominated entries for long; entries made stale by a later
+    improvement are skipped when popped (and counted in stale_pops).
+    """
+
+    def __init__(self, size):
+        self.heap = []
+        self.cost = array('d', [INF]) * size
+        self.parent = array('q', [-1]) * size
+        self.closed = bytearray(size)
+        self.pushes = 0
+        self.stale_pops = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, node, cost, parent=-1, priority=None):
+        """Enqueue node if cost improves on its best known cost"""
+        if cost >= self.cost[node] or self.closed[node]:
+            return False
+        self.cost[node] = cost
+        self.parent[node] = parent
+        self.pushes += 1
+        heapq.heappush(self.heap, (cost if priority is None else priority, node))
+        return True
+
+    def pop(self):
+        """Close and return the cheapest open node, or -1 when exhausted"""
+        heap, closed = self.heap, self.closed
+        while heap:
+            node = heapq.heappop(heap)[1]
+            if not closed[node]:
+                closed[node] = 1
+                return node
+            self.stale_pops += 1
+        return -1
+
+    def path_to(self, node):
+        """Return the best known path from the root to node"""
+        return reconstruct_path(self.parent, node)
+
+
+def single_source_costs(csr, source):
+    """Return the shortest-path cost from source to every node (inf if unreachable)"""
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    frontier = PriorityFrontier(len(csr))
+    frontier.push(source, 0)
+    push, best_cost = frontier.push, frontier.cost
+    node = frontier.pop()
+    while node != -1:
+        cost = best_cost[node]
+        for k in range(offsets[node], offsets[node + 1]):
+            push(targets[k], cost + weights[k], node)
+        node = frontier.pop()
+    return best_cost
@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from utils.graph_utils import ensure_csr
+from .frontier import PriorityFrontier
+
+# Rough size of one heap entry: the list slot, the (cost, node) tuple, a
+# float and an int
+HEAP_ENTRY_BYTES = 120
+
+
+class ShortestPathTree:
+    """A UCS from one start, suspended between queries
+
+    Settled (closed) nodes have their final cost and parent pointer, so any
+    settled goal is answered from the tree. Otherwise the search resumes from
+    the frontier: `pending` is the last popped node, not yet expanded, and
+    `steps` counts the pops so far. Resuming pops the nodes in the same order
+    as one uninterrupted run would, so paths match an uncached search.
+    """
+
+    def __init__(self, size, start_id, priority=None):
+        self.frontier = PriorityFrontier(size)
+        self.frontier.push(start_id, 0, priority=priority)
+        self.pending = -1
+        self.steps = 0
+        self.busy = False
+
+    def nbytes(self):
+        frontier = self.frontier
+        arrays = len(frontier.cost) * 8 + len(frontier.parent) * 8 + len(frontier.closed)
+        return arrays + len(frontier.heap) * HEAP_ENTRY_BYTES
+
+
+class ShortestPathCache:
+    """Shortest-path trees keyed on (graph version, start), least recently used first out
+
+    invalidate() must be called whenever the graph changes (GraphCanvas does
+    it on every edit); it bumps the version and drops every tree. Passing a
+    different graph object to csr() invalidates too. Trees are evicted until
+    their estimated size fits max_bytes. Other per-graph data, such as A*'s
+    landmark tables, is kept until the next invalidate() too (see table()).
+    The methods may be called from several threads (the GUI edits the graph
+    while a search runs on a worker).
+    """
+
+    def __init__(self, max_bytes=256 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.version = 0
+        self.trees = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.tables = {}
+        self._graph = None
+        self._csr = None
+        self._lock = threading.RLock()
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self.trees.clear()
+            self.tables.clear()
+            self.nbytes = 0
+            self._graph = self._csr = None
+
+    def csr(self, graph):
+        """The CSRGraph of graph, converted once per version"""
+        with self._lock:
+            if graph is not self._graph:
+                if self._graph is not None:
+                    self.invalidate()
+                self._graph, self._csr = graph, ensure_csr(graph)
+            return self._csr
+
+    def tree(self, csr, start_id):
+        """Check out the tree of start_id (new if not cached), or None while it is in use"""
+        with self._lock:
+            if csr is not self._csr:
+                self.csr(csr)  # A search on another graph: start over for that graph
+            key = (self.version, start_id)
+            tree = self.trees.get(key)
+            if tree is None:
+                self.misses += 1
+                tree = self.trees[key] = ShortestPathTree(len(csr), start_id)
+            else:
+                self.hits += 1
+                self.trees.move_to_end(key)
+            if tree.busy:
+                return None
+            tree.busy = True
+            return tree
+
+    def table(self, csr, key, build):
+        """The data build(csr) made for csr under key, built once per version
+
+        build runs outside the lock, so edits are not held up by it. What it
+        returns for a graph edited in the meantime is not kept.
+        """
+        with self._lock:
+            if csr is not self._csr:
+                self.csr(csr)
+            version = self.version
+            if key in self.tables:
+                return self.tables[key]
+        value = build(csr)
+        with self._lock:
+            if self.version == version and csr is self._csr:
+                self.tables[key] = value
+        return value
+
+    def release(self, tree):
+        """Return a checked out tree and evict trees beyond the memory bound"""
+        with self._lock:
+            tree.busy = False
+            self.nbytes = sum(tree.nbytes() for tree in self.trees.values())
+            while self.nbytes > self.max_bytes and self.trees:
+                _, evicted = self.trees.popitem(last=False)
+                self.nbytes -= evicted.nbytes()
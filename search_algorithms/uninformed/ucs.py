@@ -1,38 +1,201 @@
-import heapq
-import time
-from .visualizer import SearchVisualizer
+from array import array
+from heapq import heappop, heappush
+from utils.graph_utils import ensure_csr
+from utils.implicit_graph import ImplicitGraph
+from ..events import EventSource, SearchStep
+from ..trace import SearchTraceWriter, recorded
+from .frontier import INF, reconstruct_path
+from .path_cache import ShortestPathTree
 
 
-class UCS:
-    def __init__(self, graph, canvas):
-        self.visualizer = SearchVisualizer(graph, canvas)
+class UCS(EventSource):
+    """Uniform-cost search
+
+    cache is a ShortestPathCache (by default the canvas' path_cache, if any).
+    Queries from a start already searched on the unchanged graph are then
+    answered from its shortest-path tree, or by resuming its frontier.
+
+    graph may be an ImplicitGraph, searched through its successor function
+    (without a cache). With max_cost the search gives up, returning None,
+    once the cheapest open path costs more than that.
+    """
+
+    def __init__(self, graph, canvas=None, cache=None, max_cost=None):
+        super().__init__()
         self.graph = graph
+        self.max_cost = max_cost
+        self.visualizer = None
+        if isinstance(graph, ImplicitGraph):
+            self.cache = self.csr = None
+        else:
+            self.cache = cache if cache is not None else getattr(canvas, 'path_cache', None)
+            self.csr = self.cache.csr(graph) if self.cache is not None else ensure_csr(graph)
+        if canvas is not None:
+            if self.csr is None:
+                raise ValueError("Implicit graphs can't be drawn")
+            from .visualizer import SearchVisualizer
+            self.visualizer = SearchVisualizer(graph, canvas, self.stats)
+            self.subscribe(self.visualizer.on_step)
+
+    def search(self, start, goal, delay=0.5, trace=None):
+        """Run to completion; only sleeps between steps when visualized"""
+        steps = self.steps(start, goal, events=bool(self.listeners), trace=trace)
+        return self.run_steps(steps, delay if self.visualizer else 0)
+
+    def heuristic_table(self, goal_id):
+        """Per-node lower bounds on the cost to goal_id (None for plain UCS)"""
+        return None
+
+    def steps(self, start, goal, events=True, trace=None):
+        """Yield a SearchStep per popped node and return the path (or None)
+
+        With events=False nothing is yielded and the search runs at full speed.
+        trace is a file path to record the run to (see search_algorithms.trace).
+        The run's counters are left in self.stats.
+        """
+        self.stats.reset()
+        if self.csr is None:
+            if trace is not None:
+                raise ValueError("Traces need an explicit graph")
+            return self._implicit_steps(start, goal, events)
+        if trace is None:
+            return self._steps(start, goal, events)
+        writer = SearchTraceWriter(trace, self.csr.nodes, algorithm=type(self).__name__,
+                                   start=start, goal=goal)
+        return recorded(self._steps(start, goal, events, writer), writer)
+
+    def _steps(self, start, goal, events, writer=None):
+        csr = self.csr
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        goal_id = csr.node_id(goal)
+        start_id = csr.node_id(start)
+        h = self.heuristic_table(goal_id)
+        limit = INF if self.max_cost is None else self.max_cost
+        # Only plain UCS builds goal independent trees; traces need every step
+        tree = None
+        if self.cache is not None and h is None and writer is None:
+            tree = self.cache.tree(csr, start_id)
+        cached = tree is not None
+        if not cached:
+            tree = ShortestPathTree(len(csr), start_id, h[start_id] if h is not None else None)
+        frontier = tree.frontier
+        push, best_cost, closed = frontier.push, frontier.cost, frontier.closed
+        pushes, stale_pops = frontier.pushes, frontier.stale_pops
+        step = first_step = tree.steps
+        node = tree.pending
+        peak = 0
+
+        try:
+            if closed[goal_id]:
+                # Settled by an earlier query: the tree already has the answer
+                if best_cost[goal_id] > limit:
+                    return None
+                if events:
+                    yield SearchStep(step, goal, len(frontier), best_cost[goal_id],
+                                     csr.names(frontier.path_to(goal_id)))
+                return csr.names(frontier.path_to(goal_id))
+
+            while True:
+                # Expand the previous pop, which a cached tree may have left pending
+                if node != -1:
+                    cost = best_cost[node]
+                    if h is None:
+                        for k in range(offsets[node], offsets[node + 1]):
+                            push(targets[k], cost + weights[k], node)
+                    else:
+                        for k in range(offsets[node], offsets[node + 1]):
+                            neighbor = targets[k]
+                            new_cost = cost + weights[k]
+                            push(neighbor, new_cost, node, new_cost + h[neighbor])
+                    node = -1
+
+                if len(frontier) > peak:
+                    peak = len(frontier)
+                node = frontier.pop()
+                if node == -1:
+                    return None  # No path found
+                cost = best_cost[node]
+                if (cost if h is None else cost + h[node]) > limit:
+                    return None  # Left pending, so a cached tree resumes from it
+                step += 1
+
+                if events:
+                    yield SearchStep(step - 1, csr.node_name(node), len(frontier), cost,
+                                     csr.names(frontier.path_to(node)))
+                if writer is not None:
+                    writer.record(node, frontier.parent[node], len(frontier), cost)
+
+                if node == goal_id:
+                    return csr.names(frontier.path_to(node))
+        finally:
+            # Also reached when an animated run is cancelled part way
+            tree.pending, tree.steps = node, step
+            if cached:
+                self.cache.release(tree)
+            stats = self.stats
+            stats.expansions, stats.peak_frontier = step - first_step, peak
+            stats.pushes = frontier.pushes - pushes
+            stats.stale_pops = frontier.stale_pops - stale_pops
 
-    def search(self, start, goal, delay=0.5):
-        heap = [(0, start, [start])]
-        heapq.heapify(heap)
-        visited = set()
+    def _implicit_steps(self, start, goal, events):
+        space = self.graph
+        successors, decode = space.successors, space.decode
+        goal_code = space.encode(goal)
+        limit = INF if self.max_cost is None else self.max_cost
+        # States get IDs as they are first reached: code -> ID, with the ID's
+        # code, cost, parent and closed flag in parallel tables
+        ids = {space.encode(start): 0}
+        codes = list(ids)
+        cost_of = array('d', [0.0])
+        parent = array('q', [-1])
+        closed = bytearray(1)
+        heap = [(0.0, 0)]
+        step = pushes = stale = 0
+        peak = 1
 
-        while heap:
-            cost, node, path = heapq.heappop(heap)
+        def path(node):
+            return [decode(codes[i]) for i in reconstruct_path(parent, node)]
 
-            # Update visualization
-            self.visualizer.current_node = node
-            self.visualizer.visited_nodes = list(visited)
-            self.visualizer.current_path = path
-            self.visualizer.update_display()
+        try:
+            while heap:
+                if len(heap) > peak:
+                    peak = len(heap)
+                cost, node = heappop(heap)
+                if closed[node] or cost > cost_of[node]:
+                    stale += 1
+                    continue
+                if cost > limit:
+                    return None
+                closed[node] = 1
+                code = codes[node]
 
-            if node == goal:
-                return path
+                if events:
+                    yield SearchStep(step, decode(code), len(heap), cost, path(node))
+                step += 1
 
-            if node not in visited:
-                visited.add(node)
-                for neighbor in self.graph.neighbors(node):
-                    if neighbor not in visited:
-                        edge_cost = self.graph.get_edge_data(node, neighbor).get('weight', 1)
-                        new_cost = cost + edge_cost
-                        heapq.heappush(heap, (new_cost, neighbor, path + [neighbor]))
+                if code == goal_code:
+                    return path(node)
 
-            time.sleep(delay)  # Pause to see the progress
+                for successor, step_cost in successors(code):
+                    new_cost = cost + step_cost
+                    neighbor = ids.get(successor)
+                    if neighbor is None:
+                        neighbor = ids[successor] = len(codes)
+                        codes.append(successor)
+                        cost_of.append(new_cost)
+                        parent.append(node)
+                        closed.append(0)
+                    elif closed[neighbor] or new_cost >= cost_of[neighbor]:
+                        continue
+                    else:
+                        cost_of[neighbor] = new_cost
+                        parent[neighbor] = node
+                    heappush(heap, (new_cost, neighbor))
+                    pushes += 1
 
-        return None  # No path found
\ No newline at end of file
+            return None  # No path found
+        finally:
+            stats = self.stats
+            stats.expansions, stats.peak_frontier = step, peak
+            stats.pushes, stats.stale_pops = pushes + 1, stale
+            stats.states = len(codes)
@@ -1,53 +1,199 @@
-import heapq
-import tkinter as tk  # Added this import
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
+from matplotlib.collections import LineCollection
+from utils.graph_drawing import GraphDrawing
+from utils.layout import shared_layout
+from utils.render_surface import acquire_surface
+from ..stats import SearchStats
 
 
 class SearchVisualizer:
-    def __init__(self, graph, canvas):
+    """Animates a search over its graph
+
+    With explored_only (by default the canvas' explored_only setting) the
+    graph itself is not drawn, only the nodes expanded so far and the edges
+    they were first reached by.
+    """
+
+    def __init__(self, graph, canvas, stats=None, explored_only=None):
         self.graph = graph
         self.canvas = canvas
-        self.fig, self.ax = plt.subplots(figsize=(8, 6))
-        self.pos = nx.spring_layout(graph)
+        if explored_only is None:
+            explored_only = getattr(canvas, 'explored_only', False)
+        self.explored_only = explored_only
+        # Layout and drawing time go to the stats of the search being shown
+        self.stats = stats or SearchStats()
+        with self.stats.timer('layout'):
+            self.pos = shared_layout(graph, canvas)
         self.current_node = None
         self.visited_nodes = []
         self.current_path = []
+        self._visited = set()
+        self.dirty = False
 
-        # Embed matplotlib figure in Tkinter
-        self.canvas_widget = FigureCanvasTkAgg(self.fig, master=self.canvas)
-        self.canvas_widget.draw()
-        self.canvas_widget.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        # Draw on the canvas' reusable render surface
+        self.surface = acquire_surface(canvas)
+        self.fig, self.ax, self.canvas_widget = self.surface.fig, self.surface.ax, self.surface.canvas
+        with self.stats.timer('render'):
+            self.setup_artists()
+            self.surface.connect('draw_event', self.on_draw)
+            self.canvas_widget.draw()
 
-    def update_display(self):
+    def setup_artists(self):
+        """Draw the static graph once and create the per-step overlay artists"""
         self.ax.clear()
+        # Level-of-detail drawing: names and weights only show when zoomed in
+        full = not self.explored_only
+        self.drawing = GraphDrawing(self.ax, self.graph, self.pos, nodes=full, edges=full,
+                                    label_limit=getattr(self.canvas, 'label_limit', 150),
+                                    density_limit=getattr(self.canvas, 'density_limit', 50000))
+        self.ax.set_title("Search Progress", fontsize=14)
+
+        # Visited nodes accumulate in a regular artist so full redraws (resize,
+        # zoom) include them; everything else is blitted over a cached background
+        self.visited_xy = np.empty((len(self.pos), 2))
+        if self.explored_only:
+            # The edge each visited node was reached by, NaN for the start
+            self.explored_segments = np.full((len(self.pos), 2, 2), np.nan)
+            self.explored_layer, = self.ax.plot([], [], color='gray', linewidth=1, alpha=0.5, zorder=1)
+            self.new_explored_layer, = self.ax.plot([], [], color='gray', linewidth=1, alpha=0.5, zorder=1,
+                                                    animated=True)
+        self.visited_layer = self.ax.scatter([], [], s=500, c='yellow', zorder=2)
+        self.new_visited_layer = self.ax.scatter([], [], s=500, c='yellow', zorder=2, animated=True)
+        self.path_layer = LineCollection([], colors='red', linewidths=2, zorder=1, animated=True)
+        self.ax.add_collection(self.path_layer, autolim=False)
+        self.path_nodes_layer = self.ax.scatter([], [], s=500, c='yellow', zorder=2, animated=True)
+        self.current_layer = self.ax.scatter([], [], s=500, c='red', zorder=2, animated=True)
+        for layer in (self.visited_layer, self.new_visited_layer, self.path_nodes_layer, self.current_layer):
+            self.drawing.follow(layer)
+        self.background = None
+        self.drawn_visited = 0
+
+    def on_step(self, event):
+        """Record a SearchStep event; it is drawn by the next render()"""
+        # Every node popped before this step has been expanded
+        if self.current_node is not None and self.current_node not in self._visited:
+            self.visit(self.current_node, self.reached_from(self.current_node, self.current_path))
+            self.visited_nodes.append(self.current_node)
+        self.current_node = event.node
+        self.current_path = event.path
+        self.dirty = True
+
+    def render(self):
+        """Draw the recorded changes, if any (called once per animation frame)"""
+        if self.dirty:
+            with self.stats.timer('render'):
+                self.update_display()
+
+    def refresh(self):
+        """Render and let Tk process pending events (blocking runs)"""
+        self.render()
+        with self.stats.timer('render'):
+            self.canvas.update()
+
+    @staticmethod
+    def reached_from(node, path):
+        """The node next to node on its path (backward searches report paths from node on)"""
+        if len(path) < 2:
+            return None
+        return path[-2] if path[-1] == node else path[1]
 
-        # Draw all nodes and edges
-        nx.draw_networkx_nodes(self.graph, self.pos, ax=self.ax, node_size=500, node_color='lightblue')
-        nx.draw_networkx_edges(self.graph, self.pos, ax=self.ax, width=1, alpha=0.5)
+    def visit(self, node, via):
+        """Add node to the visited tables, with the edge it was reached by"""
+        count = len(self._visited)
+        self.visited_xy[count] = self.pos[node]
+        if self.explored_only:
+            self.explored_segments[count] = (self.pos[via], self.pos[node]) if via is not None else np.nan
+        self._visited.add(node)
 
-        # Highlight visited nodes
-        nx.draw_networkx_nodes(self.graph, self.pos, nodelist=self.visited_nodes,
-                               ax=self.ax, node_size=500, node_color='yellow')
+    def show_visited(self, count):
+        """Put the first count visited nodes (and their edges) in the background layers"""
+        self.visited_layer.set_offsets(self.visited_xy[:count])
+        if self.explored_only:
+            self.explored_layer.set_data(*GraphDrawing.polyline(self.explored_segments[:count]))
+
+    def seek(self, trace, step):
+        """Show the state of a recorded run at the given step (replay mode)"""
+        # Only the nodes visited or unvisited since the last step shown are read
+        count = trace.visited_count(step)
+        if count < self.drawn_visited:
+            # Seeking backwards: the visited nodes burned into the background go
+            self.background = None
+        if count < len(self.visited_nodes):
+            self._visited.difference_update(self.visited_nodes[count:])
+            del self.visited_nodes[count:]
+        begin = len(self.visited_nodes)
+        visited = trace.visited(step, begin)
+        vias = trace.reached_from(step, begin) if self.explored_only else [None] * len(visited)
+        for node, via in zip(visited, vias):
+            self.visit(node, via)
+        self.visited_nodes.extend(visited)
+        self.show_visited(count)
+
+        event = trace.event(step)
+        self.current_node = event.node
+        self.current_path = event.path
+        self.dirty = True
+        self.render()
+
+    def on_draw(self, event):
+        """Cache the background after a full redraw and put the overlay back"""
+        self.background = self.canvas_widget.copy_from_bbox(self.ax.bbox)
+        self.drawn_visited = len(self.visited_nodes)
+        self.draw_overlay()
+        self.canvas_widget.blit(self.ax.bbox)
+
+    def update_display(self):
+        """Blit the changes since the last frame over the cached background"""
+        if self.background is None:
+            self.canvas_widget.draw()
+
+        new_nodes = self.visited_nodes[self.drawn_visited:]
+        self.canvas_widget.restore_region(self.background)
+        if new_nodes:
+            # Burn newly visited nodes into the background
+            count = len(self.visited_nodes)
+            self.show_visited(count)
+            if self.explored_only:
+                new_segments = self.explored_segments[self.drawn_visited:count]
+                self.new_explored_layer.set_data(*GraphDrawing.polyline(new_segments))
+                self.ax.draw_artist(self.new_explored_layer)
+            self.new_visited_layer.set_offsets(self.visited_xy[self.drawn_visited:count])
+            self.ax.draw_artist(self.new_visited_layer)
+            for node in new_nodes:
+                self.draw_label(node)
+            self.background = self.canvas_widget.copy_from_bbox(self.ax.bbox)
+            self.drawn_visited = count
+
+        self.draw_overlay()
+        self.canvas_widget.blit(self.ax.bbox)
+        self.dirty = False
+
+    def draw_overlay(self):
+        """Draw the current path and node on top of the background"""
+        path = self.current_path or []
+        if path:
+            path_edges = list(zip(path[:-1], path[1:]))
+            self.path_layer.set_segments([(self.pos[u], self.pos[v]) for u, v in path_edges])
+            self.ax.draw_artist(self.path_layer)
+            # Path lines run under the nodes, as in the base drawing
+            path_nodes = [node for node in path if node in self._visited]
+            if path_nodes:
+                self.path_nodes_layer.set_offsets([self.pos[node] for node in path_nodes])
+                self.ax.draw_artist(self.path_nodes_layer)
+            for u, v in path_edges:
+                label = self.drawing.weight_label(u, v)
+                if label is not None:
+                    self.ax.draw_artist(label)
 
         # Highlight current node
-        if self.current_node:
-            nx.draw_networkx_nodes(self.graph, self.pos, nodelist=[self.current_node],
-                                   ax=self.ax, node_size=500, node_color='red')
-
-        # Highlight current path
-        if self.current_path:
-            path_edges = list(zip(self.current_path[:-1], self.current_path[1:]))
-            nx.draw_networkx_edges(self.graph, self.pos, edgelist=path_edges,
-                                   ax=self.ax, width=2, edge_color='red')
-
-        # Draw labels and weights
-        nx.draw_networkx_labels(self.graph, self.pos, ax=self.ax)
-        edge_weights = nx.get_edge_attributes(self.graph, 'weight')
-        if edge_weights:
-            nx.draw_networkx_edge_labels(self.graph, self.pos, edge_labels=edge_weights, ax=self.ax)
+        if self.current_node is not None:
+            self.current_layer.set_offsets([self.pos[self.current_node]])
+            self.ax.draw_artist(self.current_layer)
+        for node in set(path) | ({self.current_node} if self.current_node is not None else set()):
+            self.draw_label(node)
 
-        self.ax.set_title("Search Progress", fontsize=14)
-        self.canvas_widget.draw()
-        self.canvas.update()
\ No newline at end of file
+    def draw_label(self, node):
+        # Names are only drawn when zoomed in far enough to read them
+        label = self.drawing.label(node)
+        if label is not None:
+            self.ax.draw_artist(label)
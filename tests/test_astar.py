@@ -0,0 +1,49 @@
+import random
+import networkx as nx
+from search_algorithms.informed import heuristics
+from search_algorithms.informed.astar import AStar
+from search_algorithms.uninformed.path_cache import ShortestPathCache
+from search_algorithms.uninformed.ucs import UCS
+from utils.graph_utils import CSRGraph
+
+
+def weighted_graph(seed):
+    rng = random.Random(seed)
+    graph = nx.gnm_random_graph(300, 1200, seed=seed)
+    for u, v in graph.edges:
+        graph[u][v]['weight'] = rng.randint(1, 9)
+    return CSRGraph.from_networkx(graph)
+
+
+def cost(csr, path):
+    ids = [csr.node_id(node) for node in path]
+    return sum(csr.edge_weight(u, v) for u, v in zip(ids, ids[1:]))
+
+
+def test_landmarks_built_by_first_search_and_cached(monkeypatch):
+    built = []
+    real = heuristics.LandmarkHeuristic.__init__
+
+    def counting(self, *args, **kwargs):
+        built.append(1)
+        real(self, *args, **kwargs)
+    monkeypatch.setattr(heuristics.LandmarkHeuristic, '__init__', counting)
+
+    csr = weighted_graph(1)
+    cache = ShortestPathCache()
+    search = AStar(csr, cache=cache)
+    assert not built
+    rng = random.Random(2)
+    for _ in range(20):
+        start, goal = rng.randrange(300), rng.randrange(300)
+        path = AStar(csr, cache=cache).search(start, goal)
+        expected = UCS(csr).search(start, goal)
+        assert (path is None) == (expected is None)
+        if path is not None:
+            assert cost(csr, path) == cost(csr, expected)
+    assert len(built) == 1
+
+    # An edit drops the tables with the rest of the cache
+    cache.invalidate()
+    search.search(0, 1)
+    assert len(built) == 2
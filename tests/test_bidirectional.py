@@ -0,0 +1,47 @@
+import random
+import networkx as nx
+import pytest
+from search_algorithms.uninformed.bidirectional import BidirectionalUCS
+
+
+def weighted_graph(seed, directed):
+    rng = random.Random(seed)
+    graph = nx.gnm_random_graph(60, 150, seed=seed, directed=directed)
+    for u, v in graph.edges:
+        graph[u][v]['weight'] = rng.randint(1, 9)
+    return graph
+
+
+def path_cost(graph, path):
+    return sum(graph[u][v]['weight'] for u, v in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_costs_match_dijkstra(directed):
+    graph = weighted_graph(1, directed)
+    search = BidirectionalUCS(graph)
+    rng = random.Random(2)
+    for _ in range(200):
+        start, goal = rng.randrange(60), rng.randrange(60)
+        path = search.search(start, goal)
+        try:
+            expected = nx.dijkstra_path_length(graph, start, goal)
+        except nx.NetworkXNoPath:
+            assert path is None
+            continue
+        assert path[0] == start and path[-1] == goal
+        assert path_cost(graph, path) == expected
+
+
+def test_max_cost():
+    graph = weighted_graph(3, False)
+    start, goal = 0, max(nx.node_connected_component(graph, 0))
+    cost = nx.dijkstra_path_length(graph, start, goal)
+    assert path_cost(graph, BidirectionalUCS(graph, max_cost=cost).search(start, goal)) == cost
+    assert BidirectionalUCS(graph, max_cost=cost - 1).search(start, goal) is None
+
+
+def test_reverse_snapshot_is_built_once():
+    search = BidirectionalUCS(weighted_graph(4, True))
+    assert search.reverse is search.csr.reverse()
+    assert BidirectionalUCS(search.csr).reverse is search.reverse
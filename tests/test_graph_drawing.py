@@ -0,0 +1,42 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import networkx as nx
+from utils.graph_drawing import GraphDrawing
+from utils.graph_utils import CSRGraph
+from utils.layout import LayoutCache
+
+
+def no_conversion(monkeypatch):
+    def fail(self, *args, **kwargs):
+        raise AssertionError("snapshot was converted to networkx")
+    monkeypatch.setattr(CSRGraph, 'to_networkx', fail)
+
+
+def test_snapshot_drawn_like_networkx_graph(monkeypatch):
+    graph = nx.petersen_graph()
+    nx.set_edge_attributes(graph, 2.5, 'weight')
+    snapshot = CSRGraph.from_networkx(graph)
+    pos = nx.spring_layout(graph, seed=1)
+
+    drawn = GraphDrawing(plt.figure().gca(), graph, pos)
+    no_conversion(monkeypatch)
+    from_arrays = GraphDrawing(plt.figure().gca(), snapshot, pos)
+
+    assert from_arrays.nodes == drawn.nodes
+    assert ({frozenset(from_arrays.nodes[i] for i in edge) for edge in from_arrays.ends.tolist()} ==
+            {frozenset(drawn.nodes[i] for i in edge) for edge in drawn.ends.tolist()})
+    assert ({text.get_text() for text in from_arrays.ax.texts} ==
+            {text.get_text() for text in drawn.ax.texts})
+    plt.close('all')
+
+
+def test_large_snapshot_laid_out_without_networkx(monkeypatch):
+    snapshot = CSRGraph.from_networkx(nx.cycle_graph(100))
+    layout = LayoutCache(seed=1, spring_limit=50)
+    no_conversion(monkeypatch)
+    pos = layout.positions(snapshot)
+    assert set(pos) == set(snapshot)
+    # Touched nodes are relaxed from the snapshot's own adjacency
+    layout.touch(3)
+    assert set(layout.positions(snapshot)) == set(snapshot)
@@ -0,0 +1,25 @@
+from benchmarks.generators import complete_tsp
+from search_algorithms.tabu_search import parallel
+from search_algorithms.tabu_search.parallel import multi_start_search
+from search_algorithms.tabu_search.tabu import TabuSearch
+
+
+def test_migrants_are_kicked_per_island():
+    graph = complete_tsp(60, seed=1).graph
+    parallel._init_worker(graph)
+    migrant = TabuSearch(graph, max_iter=30, seed=0).search()
+    params = {'max_iter': 20}
+    # From the same tour the search is deterministic whatever its seed...
+    plain = [parallel._run_trajectory(seed, migrant, params, None)[0] for seed in (1, 2)]
+    assert plain[0] == plain[1]
+    # ...so each island has to start from its own kick of a migrant
+    kicked = [parallel._run_trajectory(seed, migrant, params, None, kick=True)[0] for seed in (1, 2)]
+    assert kicked[0] != kicked[1]
+
+
+def test_islands_stay_different_after_migration():
+    graph = complete_tsp(80, seed=0).graph
+    result = multi_start_search(graph, starts=3, workers=3, seed=0, max_iter=None, patience=10,
+                                migrate_every=5)
+    assert len({worker.iterations for worker in result.workers}) > 1
+    assert result.best_cost == min(worker.best_cost for worker in result.workers)
@@ -0,0 +1,47 @@
+import random
+import networkx as nx
+from search_algorithms.uninformed.path_cache import ShortestPathCache
+from search_algorithms.uninformed.ucs import UCS
+
+
+def weighted_grid(seed):
+    rng = random.Random(seed)
+    graph = nx.grid_2d_graph(15, 15)
+    for u, v in graph.edges:
+        graph[u][v]['weight'] = rng.randint(1, 9)
+    return graph
+
+
+def test_cached_queries_match_fresh_searches():
+    graph = weighted_grid(1)
+    cache = ShortestPathCache()
+    search = UCS(graph, cache=cache)
+    rng = random.Random(2)
+    nodes = list(graph)
+    # Few starts and many goals, so queries are answered from settled trees
+    # as well as by resuming them
+    starts = rng.sample(nodes, 3)
+    for _ in range(150):
+        start, goal = rng.choice(starts), rng.choice(nodes)
+        assert search.search(start, goal) == UCS(graph).search(start, goal)
+    assert cache.hits > 0
+
+
+def test_invalidate_after_edit():
+    graph = weighted_grid(3)
+    cache = ShortestPathCache()
+    start, goal = (0, 0), (14, 14)
+    UCS(graph, cache=cache).search(start, goal)
+    for u, v in graph.edges:
+        graph[u][v]['weight'] = 10 - graph[u][v]['weight']
+    cache.invalidate()
+    assert UCS(graph, cache=cache).search(start, goal) == UCS(graph).search(start, goal)
+
+
+def test_trees_fit_the_memory_bound():
+    graph = weighted_grid(4)
+    cache = ShortestPathCache(max_bytes=20000)
+    search = UCS(graph, cache=cache)
+    for start in list(graph)[:20]:
+        assert search.search(start, (14, 14)) == UCS(graph).search(start, (14, 14))
+        assert cache.nbytes <= cache.max_bytes
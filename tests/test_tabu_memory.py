@@ -0,0 +1,33 @@
+import numpy as np
+from search_algorithms.tabu_search.memory import TabuMemory
+
+
+def test_pairs_expire_after_tenure():
+    memory = TabuMemory(10, tenure=2)
+    memory.add(3, 7)
+    for _ in range(2):
+        memory.advance()
+        assert memory.is_tabu(np.array([7, 3, 1]), np.array([3, 7, 2])).tolist() == [True, True, False]
+    memory.advance()
+    assert not memory.is_tabu(np.array([3]), np.array([7])).any()
+    assert memory.active() == [] and len(memory) == 0
+
+
+def test_marking_again_extends_tenure():
+    memory = TabuMemory(10, tenure=2)
+    memory.add(1, 2)
+    memory.advance()
+    memory.add(2, 1)
+    memory.advance()
+    memory.advance()
+    assert memory.is_tabu(np.array([1]), np.array([2])).all()
+    assert memory.active() == [(2, 1)]
+
+
+def test_memory_bounded_by_tenure_not_cities():
+    memory = TabuMemory(10 ** 7, tenure=25)
+    rng = np.random.default_rng(0)
+    for a, b in rng.integers(0, 10 ** 7, (5000, 2)).tolist():
+        memory.add(a, b)
+        memory.advance()
+        assert len(memory.expires) <= 25
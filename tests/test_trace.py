@@ -0,0 +1,80 @@
+import random
+import networkx as nx
+import pytest
+from search_algorithms.informed.astar import AStar
+from search_algorithms.tabu_search.tabu import TabuSearch
+from search_algorithms.trace import load_trace
+from search_algorithms.uninformed.dfs import DFS
+from search_algorithms.uninformed.ucs import UCS
+
+
+def run(steps):
+    """The events of a step generator and its result"""
+    events = []
+    while True:
+        try:
+            events.append(next(steps))
+        except StopIteration as stop:
+            return events, stop.value
+
+
+@pytest.mark.parametrize('algorithm', [DFS, UCS, AStar])
+def test_search_replay_matches_live_run(algorithm, tmp_path):
+    rng = random.Random(1)
+    graph = nx.grid_2d_graph(12, 12)
+    for u, v in graph.edges:
+        graph[u][v]['weight'] = rng.randint(1, 9)
+    path = str(tmp_path / 'run.trace')
+    live, result = run(algorithm(graph).steps((0, 0), (11, 11), trace=path))
+
+    trace = load_trace(path)
+    assert trace.result == result
+    replayed, replay_result = run(trace.steps())
+    assert replayed == live
+    assert replay_result == result
+    for step in (0, 1, len(live) // 2, len(live) - 1):
+        assert trace.event(step) == live[step]
+        assert list(trace.steps(step)) == live[step:]
+
+
+@pytest.mark.parametrize('neighborhood', ['swap', '2-opt', 'or-opt'])
+def test_tabu_replay_matches_live_run(neighborhood, tmp_path):
+    rng = random.Random(2)
+    graph = nx.complete_graph(20)
+    for u, v in graph.edges:
+        graph[u][v]['weight'] = rng.random() * 10
+    path = str(tmp_path / 'run.trace')
+    tabu = TabuSearch(graph, max_iter=300, tabu_size=7, neighborhood=neighborhood, seed=3)
+    live, result = run(tabu.steps(trace=path))
+
+    trace = load_trace(path)
+    assert trace.result == result
+    assert run(trace.steps()) == (live, result)
+    # Seeking replays from the keyframe before the step (one per 256 moves)
+    for step in (0, 5, 255, 256, 257, len(live) - 1):
+        assert trace.event(step) == live[step]
+
+
+def test_search_seek_reads_only_up_to_the_step(tmp_path):
+    rng = random.Random(4)
+    graph = nx.grid_2d_graph(120, 120)
+    for u, v in graph.edges:
+        graph[u][v]['weight'] = rng.randint(1, 9)
+    path = str(tmp_path / 'run.trace')
+    live, _ = run(UCS(graph).steps((0, 0), (119, 119), trace=path))
+
+    trace = load_trace(path)
+    trace.block = 256
+    assert trace.event(300) == live[300]
+    # Parent pointers are only filled as far as the step sought
+    assert trace._filled <= trace.visited_count(300) + trace.block < len(trace.nodes)
+    nodes = trace.nodes
+    index = {node: i for i, node in enumerate(nodes)}
+    for step in rng.sample(range(len(live)), 50):
+        assert trace.event(step) == live[step]
+        begin = rng.randrange(trace.visited_count(step) + 1)
+        visited = trace.visited(step, begin)
+        assert visited == trace.visited(step)[begin:]
+        parents = trace.parents()
+        assert trace.reached_from(step, begin) == [
+            nodes[parents[index[node]]] if node != (0, 0) else None for node in visited]
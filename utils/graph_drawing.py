@@ -0,0 +1,281 @@
+import numpy as np
+from matplotlib.image import AxesImage
+from utils.graph_utils import CSRGraph
+
+
+class GraphDrawing:
+    """Level-of-detail drawing of a graph on matplotlib axes
+
+    Edges are drawn as one NaN-separated line and nodes as one scatter, both
+    holding only what lies in the current view; they are recomputed whenever
+    the axes limits change (toolbar zoom and pan). With more than
+    density_limit edges in view, or edges that would cover more than
+    ink_limit pixels in all (Agg's drawing time grows with their length, and
+    random layouts of large graphs are full of long edges), edges are drawn
+    as a density image instead. Nodes are left to the density image too once
+    more than density_limit of them are in view.
+
+    Node names appear once at most label_limit nodes are in view, and edge
+    weights once at most weight_limit edges are. Node markers shrink as more
+    nodes come into view.
+
+    With nodes=False and edges=False (explored-subgraph views) nothing is
+    drawn up front; labels are then only shown for the nodes and edges asked
+    for through label() and weight_label().
+    """
+
+    def __init__(self, ax, graph, pos, node_size=500, node_color='lightblue', edge_color='gray',
+                 edge_width=1.0, edge_alpha=0.5, nodes=True, edges=True, font_size=10, animated=False,
+                 label_limit=150, weight_limit=150, density_limit=50000, ink_limit=2000000):
+        self.ax = ax
+        self.graph = graph
+        if isinstance(graph, CSRGraph):
+            # Snapshots (imported graphs) are drawn straight from their arrays
+            self.directed = graph.directed
+            self.nodes = list(graph.nodes)
+            self.node_ids = graph.index
+            self.ends = np.column_stack(graph.edge_array())
+        else:
+            self.directed = graph.is_directed()
+            self.nodes = list(graph)
+            self.node_ids = index = {node: i for i, node in enumerate(self.nodes)}
+            self.ends = np.fromiter((index[node] for edge in graph.edges() for node in edge), dtype=np.int64,
+                                    count=2 * graph.number_of_edges()).reshape(-1, 2)
+        self.xy = np.array([pos[node] for node in self.nodes], dtype=float).reshape(-1, 2)
+        self.edge_index = None
+        self.node_size = node_size
+        self.font_size = font_size
+        self.show_nodes, self.show_edges = nodes, edges
+        self.label_limit, self.weight_limit = label_limit, weight_limit
+        self.density_limit, self.ink_limit = density_limit, ink_limit
+        self.labels = {}
+        self.weight_labels = {}
+        self.labels_shown = self.weights_shown = False
+        # Other scatters drawn over the nodes (e.g. visited nodes) get the same marker size
+        self.followers = []
+
+        segments = self.xy[self.ends]
+        self.edge_low, self.edge_high = segments.min(axis=1), segments.max(axis=1)
+        self.midpoints = segments.mean(axis=1)
+
+        self.density = AxesImage(ax, cmap='Greys', interpolation='nearest', origin='lower', zorder=0)
+        self.density.set_visible(False)
+        ax.add_image(self.density)
+        self.edge_layer, = ax.plot([], [], color=edge_color, linewidth=edge_width, alpha=edge_alpha,
+                                   zorder=1, scalex=False, scaley=False)
+        self.arrow_layer, = ax.plot([], [], color=edge_color, linewidth=edge_width, alpha=edge_alpha,
+                                    zorder=1, scalex=False, scaley=False)
+        self.node_layer = ax.scatter([], [], s=node_size, c=node_color, zorder=2, animated=animated)
+        self.animated = animated
+        ax.tick_params(axis='both', which='both', bottom=False, left=False, labelbottom=False, labelleft=False)
+
+        # Fit the whole graph with a margin, as ax.margins(0.1) would
+        if len(self.xy):
+            low, high = self.xy.min(axis=0), self.xy.max(axis=0)
+            margin = np.maximum((high - low) * 0.1, 0.1)
+            ax.set_xlim(low[0] - margin[0], high[0] + margin[0])
+            ax.set_ylim(low[1] - margin[1], high[1] + margin[1])
+        self.view = None
+        ax.callbacks.connect('xlim_changed', self.on_limits)
+        ax.callbacks.connect('ylim_changed', self.on_limits)
+        self.update_view()
+
+    def follow(self, layer):
+        """Keep a scatter's marker size equal to the nodes' as the zoom changes"""
+        self.followers.append(layer)
+        layer.set_sizes([self.current_size])
+
+    def on_limits(self, ax):
+        self.update_view()
+
+    def update_view(self):
+        """Hand matplotlib what lies inside the current limits, at the level of detail they allow"""
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        if self.view == (x0, x1, y0, y1):
+            return
+        self.view = (x0, x1, y0, y1)
+
+        xy = self.xy
+        in_view = np.flatnonzero((xy[:, 0] >= x0) & (xy[:, 0] <= x1) & (xy[:, 1] >= y0) & (xy[:, 1] <= y1))
+        # Edges whose bounding box meets the view, then those actually crossing it
+        low, high = self.edge_low, self.edge_high
+        edges = np.flatnonzero((high[:, 0] >= x0) & (low[:, 0] <= x1) & (high[:, 1] >= y0) & (low[:, 1] <= y1))
+        enter, leave = self.clip(edges)
+        crossing = enter <= leave
+        edges, enter, leave = edges[crossing], enter[crossing], leave[crossing]
+
+        self.labels_shown = len(in_view) <= self.label_limit
+        self.weights_shown = len(edges) <= self.weight_limit
+        self.current_size = self.node_size
+        if not self.labels_shown:
+            self.current_size = max(4.0, self.node_size * self.label_limit / len(in_view))
+        for layer in self.followers:
+            layer.set_sizes([self.current_size])
+
+        lengths = self.pixel_lengths(edges) * (leave - enter)
+        dense = self.show_edges and (len(edges) > self.density_limit or lengths.sum() > self.ink_limit)
+        dense_nodes = self.show_nodes and len(in_view) > self.density_limit
+        self.density.set_visible(dense or dense_nodes)
+        if dense or dense_nodes:
+            if not dense:
+                edges = enter = leave = lengths = edges[:0]
+            self.draw_density(in_view if dense_nodes else in_view[:0], edges, enter, leave, lengths)
+        if self.show_edges:
+            self.edge_layer.set_visible(not dense)
+            self.arrow_layer.set_visible(not dense and self.directed and self.weights_shown)
+            if not dense:
+                self.edge_layer.set_data(*self.polyline(self.xy[self.ends[edges]]))
+                if self.arrow_layer.get_visible():
+                    self.arrow_layer.set_data(*self.polyline(self.arrowheads(edges, x1 - x0)))
+        if self.show_nodes:
+            self.node_layer.set_visible(not dense_nodes)
+            self.node_layer.set_offsets(xy[in_view] if not dense_nodes else np.empty((0, 2)))
+            self.node_layer.set_sizes([self.current_size])
+
+        # Labels outside the view are hidden, not dropped, so zooming back is cheap
+        for text in self.labels.values():
+            text.set_visible(False)
+        for text in self.weight_labels.values():
+            text.set_visible(False)
+        if self.labels_shown:
+            if self.show_nodes:
+                for i in in_view.tolist():
+                    self.label(self.nodes[i])
+            else:
+                for i in in_view.tolist():
+                    text = self.labels.get(self.nodes[i])
+                    if text is not None:
+                        text.set_visible(True)
+        if self.weights_shown:
+            for k in edges.tolist():
+                if self.show_edges or k in self.weight_labels:
+                    self._weight_label(k)
+
+    def clip(self, edges):
+        """Where the given edges enter and leave the view, as fractions of their length
+
+        Liang-Barsky clipping; edges missing the view get enter > leave.
+        """
+        x0, x1, y0, y1 = self.view
+        start = self.xy[self.ends[edges, 0]]
+        delta = self.xy[self.ends[edges, 1]] - start
+        enter, leave = np.zeros(len(edges)), np.ones(len(edges))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for p, q in ((-delta[:, 0], start[:, 0] - x0), (delta[:, 0], x1 - start[:, 0]),
+                         (-delta[:, 1], start[:, 1] - y0), (delta[:, 1], y1 - start[:, 1])):
+                ratio = q / p
+                enter = np.where(p < 0, np.maximum(enter, ratio), enter)
+                leave = np.where(p > 0, np.minimum(leave, ratio), leave)
+                # Parallel to this side and outside it
+                leave = np.where((p == 0) & (q < 0), -1.0, leave)
+        return enter, leave
+
+    def pixel_lengths(self, edges):
+        """Full on-screen length of the given edges at the current zoom"""
+        x0, x1, y0, y1 = self.view
+        scale = np.array([self.ax.bbox.width / (x1 - x0), self.ax.bbox.height / (y1 - y0)])
+        extent = (self.xy[self.ends[edges, 1]] - self.xy[self.ends[edges, 0]]) * scale
+        return np.hypot(extent[:, 0], extent[:, 1])
+
+    @staticmethod
+    def polyline(segments):
+        """x and y of (n, 2, 2) segments as one line broken by NaNs"""
+        lines = np.full((len(segments), 3, 2), np.nan)
+        lines[:, :2] = segments
+        return lines[:, :, 0].ravel(), lines[:, :, 1].ravel()
+
+    def arrowheads(self, edges, width):
+        """Two-stroke arrowheads three quarters of the way along directed edges"""
+        start, end = self.xy[self.ends[edges, 0]], self.xy[self.ends[edges, 1]]
+        direction = end - start
+        length = np.hypot(direction[:, 0], direction[:, 1])[:, None]
+        direction = np.divide(direction, length, out=np.zeros_like(direction), where=length > 0)
+        tip = start + 0.75 * (end - start)
+        back = tip - direction * width * 0.02
+        side = direction[:, ::-1] * [-1, 1] * width * 0.01
+        heads = np.empty((2 * len(edges), 2, 2))
+        heads[0::2, 0], heads[0::2, 1] = back + side, tip
+        heads[1::2, 0], heads[1::2, 1] = back - side, tip
+        return heads
+
+    def draw_density(self, in_view, edges, enter, leave, lengths):
+        """Show nodes and points sampled along the visible parts of edges as a histogram image"""
+        x0, x1, y0, y1 = self.view
+        width, height = self.ax.bbox.width, self.ax.bbox.height
+        bins = (max(int(width / 3), 1), max(int(height / 3), 1))
+        # Up to about 250k points along the edges, each weighted by the
+        # length it stands for so few long edges do not break up into specks
+        samples = int(np.clip(250000 // max(len(edges), 1), 4, 300))
+        start, end = self.xy[self.ends[edges, 0]], self.xy[self.ends[edges, 1]]
+        t = enter[:, None] + (leave - enter)[:, None] * ((np.arange(samples) + 0.5) / samples)
+        points = (start[:, None] + (end - start)[:, None] * t[:, :, None]).reshape(-1, 2)
+        weights = np.repeat(lengths / samples, samples)
+        points = np.concatenate((points, self.xy[in_view]))
+        weights = np.concatenate((weights, np.ones(len(in_view))))
+        counts, _, _ = np.histogram2d(points[:, 0], points[:, 1], bins=bins, range=((x0, x1), (y0, y1)),
+                                      weights=weights)
+        self.density.set_data(np.log1p(counts.T))
+        self.density.set_extent((x0, x1, y0, y1))
+        self.density.set_clim(0, max(np.log1p(counts.max()), 1))
+
+    def in_view(self, x, y):
+        x0, x1, y0, y1 = self.view
+        return x0 <= x <= x1 and y0 <= y <= y1
+
+    def label(self, node):
+        """The name label of node, created on first use; None when names are not shown at this zoom
+
+        Labels of nodes outside the view are not shown either, as drawing
+        text is costly even where it is clipped away.
+        """
+        if not self.labels_shown:
+            return None
+        x, y = self.xy[self.node_ids[node]]
+        if not self.in_view(x, y):
+            return None
+        text = self.labels.get(node)
+        if text is None:
+            text = self.labels[node] = self.ax.text(x, y, str(node), fontsize=self.font_size,
+                                                    ha='center', va='center', clip_on=True,
+                                                    animated=self.animated)
+        text.set_visible(True)
+        return text
+
+    def weight_label(self, u, v):
+        """The weight label of edge u-v, created on first use; None when weights are not shown"""
+        if not self.weights_shown:
+            return None
+        if self.edge_index is None:
+            # Built the first time a single edge's label is asked for
+            self.edge_index = {(self.nodes[u], self.nodes[v]): k for k, (u, v) in enumerate(self.ends.tolist())}
+        k = self.edge_index.get((u, v))
+        if k is None and not self.directed:
+            k = self.edge_index.get((v, u))
+        if k is None or not self.in_view(*self.midpoints[k]):
+            return None
+        return self._weight_label(k)
+
+    def _weight_label(self, k):
+        text = self.weight_labels.get(k)
+        if text is None:
+            u, v = self.ends[k]
+            if isinstance(self.graph, CSRGraph):
+                weight = self.graph.edge_weight(u, v)
+            else:
+                weight = self.graph.edges[self.nodes[u], self.nodes[v]].get('weight')
+            if weight is None:
+                return None
+            x, y = self.midpoints[k]
+            text = self.weight_labels[k] = self.ax.text(
+                x, y, str(weight), fontsize=8, ha='center', va='center', clip_on=True, zorder=1,
+                bbox=dict(boxstyle='round', ec=(1.0, 1.0, 1.0), fc=(1.0, 1.0, 1.0)))
+        text.set_visible(True)
+        return text
+
+    def draw_animated(self):
+        """Draw the animated nodes and visible labels (animated drawings, in blitted overlays)"""
+        if self.node_layer.get_visible():
+            self.ax.draw_artist(self.node_layer)
+        for text in self.labels.values():
+            if text.get_visible():
+                self.ax.draw_artist(text)
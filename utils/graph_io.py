@@ -0,0 +1,228 @@
+import itertools
+import json
+import mmap
+import os
+import struct
+import xml.etree.ElementTree as ET
+import numpy as np
+from utils.graph_utils import CSRGraph, node_from_json
+
+# Binary graph file: a fixed header, the three CSR buffers back to back
+# (int64 offsets, int64 targets, float64 weights) and the node names as JSON.
+# Loading maps the file and hands views of the buffers to CSRGraph unchanged.
+MAGIC = b'CSRGRAPH'
+VERSION = 1
+HEADER = struct.Struct('<8sIIqqqq')  # magic, version, flags, nodes, entries, names at, names size
+DIRECTED = 1
+RANGE_NAMES = 2  # Nodes are 0..n-1, no names stored
+
+
+class EdgeListBuilder:
+    """Collects edges chunk by chunk as integer IDs and builds a CSRGraph once
+
+    Names are interned per chunk over the chunk's unique names only, and the
+    edges are kept as NumPy arrays, so no per-edge Python objects survive a
+    chunk. As with repeated add_edge calls, the last weight of an edge wins.
+    """
+
+    def __init__(self, directed=False):
+        self.directed = directed
+        self.index = {}
+        self.names = []
+        self.sources = []
+        self.targets = []
+        self.weights = []
+
+    def intern(self, names):
+        """Map an array of node names to IDs, adding unseen names"""
+        if not len(names):
+            return np.empty(0, dtype=np.int64)
+        unique, inverse = np.unique(names, return_inverse=True)
+        index, known = self.index, self.names
+        ids = np.empty(len(unique), dtype=np.int64)
+        for i, name in enumerate(unique.tolist()):
+            node = index.get(name)
+            if node is None:
+                node = index[name] = len(known)
+                known.append(name)
+            ids[i] = node
+        return ids[inverse.ravel()]
+
+    def add_nodes(self, names):
+        self.intern(np.asarray(names))
+
+    def add_edges(self, sources, targets, weights=None):
+        sources, targets = self.intern(np.asarray(sources)), self.intern(np.asarray(targets))
+        if weights is None:
+            weights = np.ones(len(sources))
+        self.sources.append(sources)
+        self.targets.append(targets)
+        self.weights.append(np.asarray(weights, dtype=np.float64))
+
+    def build(self):
+        """Return the CSRGraph of everything added (node IDs sorted by name)"""
+        n = len(self.names)
+        sources = np.concatenate(self.sources) if self.sources else np.empty(0, dtype=np.int64)
+        targets = np.concatenate(self.targets) if self.targets else np.empty(0, dtype=np.int64)
+        weights = np.concatenate(self.weights) if self.weights else np.empty(0)
+
+        # Renumber so that ID order matches name order, as from_networkx does
+        nodes = self.names
+        try:
+            order = sorted(range(n), key=nodes.__getitem__)
+            nodes = [nodes[i] for i in order]
+            rank = np.empty(n, dtype=np.int64)
+            rank[order] = np.arange(n)
+            sources, targets = rank[sources], rank[targets]
+        except TypeError:
+            pass  # Mixed node types keep insertion order
+
+        return CSRGraph.from_arrays(nodes, sources, targets, weights, directed=self.directed)
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def read_edge_list(path, delimiter=',', directed=False, chunk_size=100000, header='auto'):
+    """Stream a `source, target[, weight]` file into a CSRGraph
+
+    Lines are parsed chunk_size at a time with NumPy. header='auto' skips a
+    first line that names its columns; '#' starts a comment.
+    """
+    builder = EdgeListBuilder(directed)
+    with open(path, newline='') as f:
+        first = f.readline()
+        fields = [field.strip() for field in first.split(delimiter)]
+        if header == 'auto':
+            header = len(fields) >= 2 and (
+                fields[0].lower() in ('source', 'src', 'from', 'u')
+                or (len(fields) > 2 and not _is_number(fields[2])))
+        lines = f if header else itertools.chain([first], f)
+
+        while True:
+            chunk = list(itertools.islice(lines, chunk_size))
+            if not chunk:
+                break
+            rows = np.loadtxt(chunk, dtype=str, delimiter=delimiter, comments='#', ndmin=2)
+            if not len(rows):
+                continue
+            rows = np.char.strip(rows)
+            weights = rows[:, 2].astype(np.float64) if rows.shape[1] > 2 else None
+            builder.add_edges(rows[:, 0], rows[:, 1], weights)
+    return builder.build()
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def read_graphml(path, weight='weight', chunk_size=100000):
+    """Stream a GraphML file into a CSRGraph, clearing each element once read"""
+    builder = graph = None
+    weight_key = None
+    nodes, sources, targets, weights = [], [], [], []
+
+    for event, elem in ET.iterparse(path, events=('start', 'end')):
+        tag = _local(elem.tag)
+        if event == 'start':
+            if tag == 'graph' and builder is None:
+                builder = EdgeListBuilder(elem.get('edgedefault') == 'directed')
+                graph = elem
+            continue
+
+        if tag == 'key':
+            if elem.get('attr.name') == weight and elem.get('for') in ('edge', 'all', None):
+                weight_key = elem.get('id')
+        elif tag == 'node':
+            nodes.append(elem.get('id'))
+            elem.clear()
+        elif tag == 'edge':
+            value = 1.0
+            for data in elem:
+                if data.get('key') == weight_key:
+                    value = float(data.text)
+            sources.append(elem.get('source'))
+            targets.append(elem.get('target'))
+            weights.append(value)
+            elem.clear()
+        else:
+            continue
+
+        if len(nodes) >= chunk_size or len(sources) >= chunk_size:
+            builder.add_nodes(nodes)
+            builder.add_edges(sources, targets, weights)
+            nodes, sources, targets, weights = [], [], [], []
+            graph.clear()  # Drop the emptied elements read so far
+
+    if builder is None:
+        raise ValueError(f"{path} contains no <graph> element")
+    builder.add_nodes(nodes)
+    builder.add_edges(sources, targets, weights)
+    return builder.build()
+
+
+def save_csr(csr, path):
+    """Write a CSRGraph in the binary format read by load_csr"""
+    flags = DIRECTED if csr.directed else 0
+    if isinstance(csr.nodes, range) and csr.nodes.start == 0 and csr.nodes.step == 1:
+        flags |= RANGE_NAMES
+        names = b''
+    else:
+        names = json.dumps(list(csr.nodes)).encode('utf-8')
+
+    offsets, targets, weights = csr.as_numpy()
+    body = HEADER.size + offsets.nbytes + targets.nbytes + weights.nbytes
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, len(csr), len(targets), body, len(names)))
+        for buffer in (offsets, targets, weights):
+            f.write(memoryview(np.ascontiguousarray(buffer)))
+        f.write(names)
+
+
+def load_csr(path):
+    """Memory map a binary graph file as a CSRGraph without copying its buffers"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:8] != MAGIC:
+            raise ValueError(f"{path} is not a binary graph file")
+        magic, version, flags, n, entries, names_at, names_size = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary graph version {version}")
+        if os.path.getsize(path) < names_at + names_size:
+            raise ValueError(f"{path} is truncated")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(mapped)
+    start = HEADER.size
+    offsets = view[start:start + 8 * (n + 1)].cast('q')
+    start += 8 * (n + 1)
+    targets = view[start:start + 8 * entries].cast('q')
+    start += 8 * entries
+    weights = view[start:start + 8 * entries].cast('d')
+
+    if flags & RANGE_NAMES:
+        nodes = range(n)
+    else:
+        nodes = [node_from_json(node) for node in json.loads(bytes(view[names_at:names_at + names_size]))]
+    return CSRGraph(nodes, offsets, targets, weights, directed=bool(flags & DIRECTED))
+
+
+def read_graph(path, directed=False):
+    """Read a graph file into a CSRGraph, picking the reader by extension
+
+    .graphml is GraphML, .csrg the binary format, .tsv/.txt whitespace
+    separated edge lists and anything else comma separated edge lists.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.graphml':
+        return read_graphml(path)
+    if extension == '.csrg':
+        return load_csr(path)
+    if extension in ('.tsv', '.txt', '.edges'):
+        return read_edge_list(path, delimiter=None, directed=directed)
+    return read_edge_list(path, directed=directed)
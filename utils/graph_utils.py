@@ -0,0 +1,248 @@
+from array import array
+from bisect import bisect_left
+import networkx as nx
+import numpy as np
+
+
+class CSRGraph:
+    """Frozen, integer-indexed graph snapshot with CSR adjacency buffers
+
+    Node names are interned to ints 0..n-1 (sorted by name when the names are
+    comparable, so ID order matches name order). The neighbours of node ``u``
+    are ``targets[offsets[u]:offsets[u + 1]]`` with matching ``weights``,
+    sorted by ID within each row.
+    """
+
+    def __init__(self, nodes, offsets, targets, weights, directed=False):
+        self.nodes = nodes
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.directed = directed
+        self._index = None
+        self._reverse = None
+
+    @classmethod
+    def from_networkx(cls, graph, weight='weight', default=1.0):
+        """Build a snapshot from a networkx graph"""
+        nodes = list(graph.nodes())
+        try:
+            nodes.sort()
+        except TypeError:
+            pass  # Mixed node types keep insertion order
+        index = {node: i for i, node in enumerate(nodes)}
+
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('d')
+        adj = graph.adj
+        for node in nodes:
+            row = sorted((index[nbr], data.get(weight, default))
+                         for nbr, data in adj[node].items())
+            targets.extend(nbr for nbr, _ in row)
+            weights.extend(w for _, w in row)
+            offsets.append(len(targets))
+
+        csr = cls(nodes, offsets, targets, weights, directed=graph.is_directed())
+        csr._index = index
+        return csr
+
+    @classmethod
+    def from_arrays(cls, nodes, sources, targets, weights=None, directed=False):
+        """Build a snapshot from parallel NumPy arrays of edge endpoint IDs
+
+        nodes are the names of IDs 0..n-1 (a range for unnamed nodes). Edges
+        of undirected graphs are given once; for repeated edges the last
+        weight wins, as with repeated add_edge calls.
+        """
+        n = len(nodes)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=np.float64)
+        sequence = np.arange(len(sources))
+        if not directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            weights = np.concatenate((weights, weights))
+            sequence = np.concatenate((sequence, sequence))
+        order = np.lexsort((sequence, targets, sources))
+        sources, targets, weights = sources[order], targets[order], weights[order]
+        # Keep the last entry of every (source, target) run
+        last = np.ones(len(sources), dtype=bool)
+        last[:-1] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        sources, targets, weights = sources[last], targets[last], weights[last]
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+        return cls(nodes, _to_array('q', offsets), _to_array('q', targets),
+                   _to_array('d', weights), directed=directed)
+
+    @property
+    def index(self):
+        """Mapping of node name to node ID"""
+        if self._index is None:
+            if isinstance(self.nodes, range):
+                self._index = self.nodes
+            else:
+                self._index = {node: i for i, node in enumerate(self.nodes)}
+        return self._index
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __contains__(self, node):
+        if isinstance(self.nodes, range):
+            return node in self.nodes
+        return node in self.index
+
+    def number_of_edges(self):
+        """Return the number of edges (undirected edges are stored twice)"""
+        if self.directed:
+            return len(self.targets)
+        return len(self.targets) // 2
+
+    def node_id(self, node):
+        """Return the integer ID of a node name"""
+        if isinstance(self.nodes, range):
+            if node not in self.nodes:
+                raise KeyError(node)
+            return node
+        return self.index[node]
+
+    def node_name(self, node_id):
+        """Return the node name of an integer ID"""
+        return self.nodes[node_id]
+
+    def names(self, node_ids):
+        """Translate a sequence of node IDs back to node names"""
+        nodes = self.nodes
+        return [nodes[i] for i in node_ids]
+
+    def neighbors(self, node_id):
+        """Return the neighbour IDs of a node"""
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def edges(self, node_id):
+        """Yield (neighbor, weight) pairs of a node"""
+        targets, weights = self.targets, self.weights
+        for k in range(self.offsets[node_id], self.offsets[node_id + 1]):
+            yield targets[k], weights[k]
+
+    def degree(self, node_id):
+        """Return the out-degree of a node"""
+        return self.offsets[node_id + 1] - self.offsets[node_id]
+
+    def edge_weight(self, u, v, default=None):
+        """Return the weight of edge u-v, or default if there is no such edge"""
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        k = bisect_left(self.targets, v, lo, hi)
+        if k < hi and self.targets[k] == v:
+            return self.weights[k]
+        return default
+
+    def edge_array(self):
+        """Return (sources, targets) ID arrays holding every edge once"""
+        offsets, targets, _ = self.as_numpy()
+        sources = np.repeat(np.arange(len(self)), np.diff(offsets))
+        if not self.directed:
+            # Undirected edges are stored in both rows
+            keep = sources <= targets
+            return sources[keep], targets[keep]
+        return sources, targets
+
+    def as_numpy(self):
+        """Return zero-copy NumPy views of (offsets, targets, weights)"""
+        return (np.frombuffer(self.offsets, dtype=np.int64),
+                np.frombuffer(self.targets, dtype=np.int64),
+                np.frombuffer(self.weights, dtype=np.float64))
+
+    def to_dense(self, missing=np.inf):
+        """Return an n x n NumPy weight matrix (zero diagonal, absent edges = missing)"""
+        n = len(self)
+        matrix = np.full((n, n), missing, dtype=np.float64)
+        offsets, targets, weights = self.as_numpy()
+        sources = np.repeat(np.arange(n), np.diff(offsets))
+        matrix[sources, targets] = weights
+        np.fill_diagonal(matrix, 0)
+        return matrix
+
+    def reverse(self):
+        """Return the snapshot with every edge reversed (itself if undirected)
+
+        Built on the first call and kept, as snapshots don't change.
+        """
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            offsets, targets, weights = self.as_numpy()
+            sources = np.repeat(np.arange(len(self)), np.diff(offsets))
+            reverse = CSRGraph.from_arrays(self.nodes, targets, sources, weights, directed=True)
+            reverse._index = self._index
+            reverse._reverse = self
+            self._reverse = reverse
+        return self._reverse
+
+    def nbytes(self):
+        """Return the size of the adjacency buffers in bytes"""
+        return sum(memoryview(buf).nbytes for buf in (self.offsets, self.targets, self.weights))
+
+    def to_networkx(self, weight='weight'):
+        """Rebuild a networkx graph from the snapshot"""
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+        graph.add_nodes_from(self.nodes)
+        offsets, targets, weights = self.as_numpy()
+        sources = np.repeat(np.arange(len(self)), np.diff(offsets))
+        if not self.directed:
+            # Undirected edges are stored in both rows; add each once
+            keep = sources <= targets
+            sources, targets, weights = sources[keep], targets[keep], weights[keep]
+        name = self.nodes.__getitem__
+        graph.add_weighted_edges_from(
+            zip(map(name, sources.tolist()), map(name, targets.tolist()), weights.tolist()),
+            weight=weight)
+        return graph
+
+
+def _to_array(typecode, values):
+    """Copy a NumPy array into an array.array (fast scalar indexing)"""
+    buffer = array(typecode)
+    buffer.frombytes(np.ascontiguousarray(values).tobytes())
+    return buffer
+
+
+def ensure_csr(graph):
+    """Return a CSRGraph for either a networkx graph or an existing snapshot"""
+    if isinstance(graph, CSRGraph):
+        return graph
+    return CSRGraph.from_networkx(graph)
+
+
+def ensure_networkx(graph):
+    """Return a networkx graph for either a networkx graph or a snapshot"""
+    if isinstance(graph, CSRGraph):
+        return graph.to_networkx()
+    return graph
+
+
+def resolve_node(graph, name):
+    """Resolve a node name given as a string (typed in, or read from CSV)
+
+    Graphs saved with int nodes load with int nodes, so "3" means node 3 there.
+    """
+    if name in graph:
+        return name
+    try:
+        if int(name) in graph:
+            return int(name)
+    except (TypeError, ValueError):
+        pass
+    raise ValueError(f"Node {name!r} not in graph")
+
+
+def node_from_json(value):
+    """Undo JSON's conversion of tuple node names to lists"""
+    if isinstance(value, list):
+        return tuple(node_from_json(item) for item in value)
+    return value
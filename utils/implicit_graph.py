@@ -0,0 +1,138 @@
+import random
+
+
+class ImplicitGraph:
+    """A graph given by a successor function instead of stored adjacency
+
+    States are encoded as ints (encode/decode); the searches only keep the
+    codes of the states they touch, in hashed sets and tables keyed by
+    code. Subclasses implement encode, decode and successors(code), which
+    yields (successor code, step cost) pairs.
+    """
+
+    directed = False
+
+    def encode(self, state):
+        raise NotImplementedError
+
+    def decode(self, code):
+        raise NotImplementedError
+
+    def successors(self, code):
+        raise NotImplementedError
+
+    def __contains__(self, state):
+        try:
+            self.encode(state)
+        except (ValueError, TypeError):
+            return False
+        return True
+
+
+def _mix(value):
+    """SplitMix64 finalizer: a well spread 64-bit hash of an int"""
+    value = (value + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return value ^ (value >> 31)
+
+
+class GridWorld(ImplicitGraph):
+    """4-connected width x height grid of (x, y) cells with blocked cells
+
+    Each cell is blocked with probability obstacle_density, decided by
+    hashing the cell with the seed, so no per-cell storage exists even for
+    grids of billions of cells. Extra blocked cells can be given as a set
+    of (x, y), and clear() opens cells. Moves cost 1.
+    """
+
+    def __init__(self, width, height, obstacle_density=0.2, seed=0, obstacles=()):
+        self.width = width
+        self.height = height
+        self.threshold = int(obstacle_density * 2 ** 64)
+        self.salt = _mix(seed)
+        self.obstacles = {y * width + x for x, y in obstacles}
+        self.cleared = set()
+
+    def blocked(self, code):
+        if code in self.obstacles:
+            return True
+        return _mix(code ^ self.salt) < self.threshold and code not in self.cleared
+
+    def encode(self, state):
+        x, y = state
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Cell {state} is outside the grid")
+        return y * self.width + x
+
+    def decode(self, code):
+        y, x = divmod(code, self.width)
+        return x, y
+
+    def successors(self, code):
+        width = self.width
+        y, x = divmod(code, width)
+        if x > 0 and not self.blocked(code - 1):
+            yield code - 1, 1
+        if x < width - 1 and not self.blocked(code + 1):
+            yield code + 1, 1
+        if y > 0 and not self.blocked(code - width):
+            yield code - width, 1
+        if y < self.height - 1 and not self.blocked(code + width):
+            yield code + width, 1
+
+    def clear(self, *cells):
+        """Unblock the given cells (e.g. the start and goal)"""
+        for cell in cells:
+            code = self.encode(cell)
+            self.obstacles.discard(code)
+            self.cleared.add(code)
+
+
+class SlidingPuzzle(ImplicitGraph):
+    """The size x size sliding-tile puzzle (8-puzzle for size 3, 15-puzzle for 4)
+
+    A state is the tuple of tiles in row-major order with 0 for the blank.
+    The code packs 4 bits per tile above 4 bits holding the blank's
+    position, so moves are a few shifts on the code. Moves cost 1.
+    """
+
+    def __init__(self, size=3):
+        if not 2 <= size <= 4:
+            raise ValueError("Puzzle size must be 2, 3 or 4")
+        self.size = size
+        self.cells = size * size
+        self.goal = tuple(range(1, self.cells)) + (0,)
+
+    def encode(self, state):
+        if sorted(state) != list(range(self.cells)):
+            raise ValueError(f"{state} is not a {self.size}x{self.size} puzzle state")
+        code = 0
+        for tile in reversed(state):
+            code = (code << 4) | tile
+        return (code << 4) | state.index(0)
+
+    def decode(self, code):
+        code >>= 4
+        return tuple((code >> (4 * i)) & 15 for i in range(self.cells))
+
+    def successors(self, code):
+        size = self.size
+        blank = code & 15
+        row, column = divmod(blank, size)
+        for position, allowed in ((blank - size, row > 0), (blank + size, row < size - 1),
+                                  (blank - 1, column > 0), (blank + 1, column < size - 1)):
+            if allowed:
+                # Move the tile at position into the blank
+                tile = (code >> (4 * position + 4)) & 15
+                moved = code & ~(15 << (4 * position + 4)) & ~15
+                yield moved | (tile << (4 * blank + 4)) | position, 1
+
+    def scramble(self, moves=50, seed=None):
+        """A solvable state: the goal after that many random moves"""
+        rng = random.Random(seed)
+        code = self.encode(self.goal)
+        for _ in range(moves):
+            code = rng.choice([successor for successor, _ in self.successors(code)])
+        return self.decode(code)
+
@@ -0,0 +1,116 @@
+import networkx as nx
+import numpy as np
+from utils.graph_utils import CSRGraph, ensure_networkx
+
+
+class LayoutCache:
+    """Node positions shared by the graph canvas and the search visualizers
+
+    Positions are keyed on a structure version that every mutation bumps via
+    touch(). On the next request only the touched nodes are relaxed, starting
+    from the previous positions (new nodes start next to their placed
+    neighbours). A full spring layout, itself seeded from the old positions,
+    only runs when there is no layout yet or most of the graph changed. Graphs
+    above spring_limit nodes get a random layout instead, which is O(n).
+    Snapshots (CSRGraph) are laid out without converting them to networkx
+    unless they are small enough for a spring layout.
+    """
+
+    def __init__(self, seed=None, iterations=30, full_fraction=0.25, spring_limit=5000):
+        self.pos = {}
+        self.version = 0
+        self.layout_version = -1
+        self.dirty = set()
+        self.seed = seed
+        self.iterations = iterations
+        self.full_fraction = full_fraction
+        self.spring_limit = spring_limit
+        self.rng = np.random.default_rng(seed)
+
+    def touch(self, *nodes):
+        """Record that the given nodes were added or got new edges"""
+        self.dirty.update(nodes)
+        self.version += 1
+
+    def reset(self):
+        """Forget all positions (e.g. after the graph was cleared)"""
+        self.pos = {}
+        self.dirty.clear()
+        self.version += 1
+
+    def positions(self, graph):
+        """Return {node: (x, y)} for graph, updating the cached layout if needed"""
+        if self.layout_version == self.version and len(self.pos) == len(graph):
+            return self.pos
+
+        # Pick up nodes added or removed behind the cache's back
+        for node in [node for node in self.pos if node not in graph]:
+            del self.pos[node]
+        dirty = {node for node in self.dirty if node in graph}
+        dirty.update(node for node in graph if node not in self.pos)
+
+        if not self.pos or len(dirty) > self.full_fraction * len(graph):
+            if len(graph) > self.spring_limit and isinstance(graph, CSRGraph):
+                xy = np.random.default_rng(self.seed).random((len(graph), 2))
+                self.pos = dict(zip(graph.nodes, xy))
+            elif len(graph) > self.spring_limit:
+                self.pos = nx.random_layout(graph, seed=self.seed)
+            else:
+                self.pos = nx.spring_layout(ensure_networkx(graph), pos=self.pos or None, seed=self.seed)
+        elif dirty:
+            self.relax(graph, dirty)
+
+        self.dirty.clear()
+        self.layout_version = self.version
+        return self.pos
+
+    def relax(self, graph, nodes):
+        """Fruchterman-Reingold steps that only move the given nodes"""
+        nodes = list(nodes)
+        if isinstance(graph, CSRGraph):
+            def neighbors(node):
+                return graph.names(graph.neighbors(graph.node_id(node)))
+        else:
+            neighbors = graph.neighbors
+        for node in nodes:
+            if node not in self.pos:
+                placed = [self.pos[nbr] for nbr in neighbors(node) if nbr in self.pos]
+                centre = np.mean(placed, axis=0) if placed else np.zeros(2)
+                self.pos[node] = centre + self.rng.uniform(-0.05, 0.05, 2)
+
+        order = list(self.pos)
+        index = {node: i for i, node in enumerate(order)}
+        xy = np.array([self.pos[node] for node in order], dtype=float)
+        moving = np.array([index[node] for node in nodes])
+        src, dst = [], []
+        for i, node in enumerate(nodes):
+            for nbr in neighbors(node):
+                if nbr != node:
+                    src.append(i)
+                    dst.append(index[nbr])
+        src, dst = np.array(src, dtype=int), np.array(dst, dtype=int)
+
+        k = 1 / np.sqrt(len(order))
+        temperature = 0.1
+        for _ in range(self.iterations):
+            delta = xy[moving][:, None, :] - xy[None, :, :]
+            distance = np.maximum(np.linalg.norm(delta, axis=2), 0.01)
+            displacement = np.einsum('ijk,ij->ik', delta, k * k / distance ** 2)
+            if len(src):
+                pull = xy[dst] - xy[moving][src]
+                force = pull * np.linalg.norm(pull, axis=1)[:, None] / k
+                np.add.at(displacement, src, force)
+            length = np.maximum(np.linalg.norm(displacement, axis=1), 0.01)
+            xy[moving] += displacement * (np.minimum(length, temperature) / length)[:, None]
+            temperature -= 0.1 / self.iterations
+
+        for i in moving:
+            self.pos[order[i]] = xy[i]
+
+
+def shared_layout(graph, canvas):
+    """Positions from the canvas' layout cache, or a fresh layout without one"""
+    cache = getattr(canvas, 'layout', None)
+    if cache is None:
+        return nx.spring_layout(ensure_networkx(graph))
+    return cache.positions(graph)
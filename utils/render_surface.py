@@ -0,0 +1,63 @@
+import tkinter as tk
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+# Let Agg render very long paths (bulk-drawn edges of large graphs) in pieces
+matplotlib.rcParams['agg.path.chunksize'] = 10000
+
+
+class RenderSurface:
+    """A matplotlib figure embedded in a Tk widget, reused across algorithm runs
+
+    The figure is not registered with pyplot, and reset() clears the axes and
+    disconnects the callbacks of the previous run, so repeated runs neither
+    pile up figures nor leave stale draw handlers behind.
+    """
+
+    def __init__(self, master, figsize=(8, 6), dpi=100):
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self.connections = []
+        self.runs = 0
+
+    def reset(self):
+        """Clear the figure and drop callbacks registered by the previous user"""
+        for cid in self.connections:
+            self.canvas.mpl_disconnect(cid)
+        self.connections = []
+        self.ax.clear()
+        self.runs += 1
+        return self
+
+    def connect(self, event, callback):
+        """mpl_connect a callback that is dropped again on the next reset()"""
+        cid = self.canvas.mpl_connect(event, callback)
+        self.connections.append(cid)
+        return cid
+
+    def show(self):
+        self.widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+    def footprint(self):
+        """Figure count and memory estimate of the surface"""
+        width, height = self.canvas.get_width_height()
+        return {
+            'pyplot_figures': len(plt.get_fignums()),
+            'artists': len(self.ax.get_children()),
+            'callbacks': len(self.connections),
+            'runs': self.runs,
+            'buffer_bytes': width * height * 4,
+        }
+
+
+def acquire_surface(master):
+    """Reuse the master's render surface, or create a standalone one inside it"""
+    if hasattr(master, 'acquire_surface'):
+        return master.acquire_surface()
+    surface = RenderSurface(master)
+    surface.show()
+    return surface